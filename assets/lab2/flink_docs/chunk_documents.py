@@ -7,16 +7,86 @@ Parameters based on ML_CHARACTER_TEXT_SPLITTER:
 - chunk_size: 5000 characters per chunk
 - overlap: 200 characters overlap between chunks
 - separator: Split on "#" and "##" headings (but not "###" and smaller)
+
+With --tokenizer, chunk sizes are measured in tokens instead of characters
+so chunks fit the embedding model's token limit.
 """
 
+import hashlib
+import json
+import mmap
 import os
 import re
+import struct
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import date, datetime
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import yaml
 
 
+# libyaml's C loader is several times faster than the pure-Python SafeLoader
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Flat "key: value" lines as written by save_chunks_as_markdown
+_FLAT_LINE = re.compile(r"([A-Za-z_][\w-]*):(?: (.*))?")
+_PLAIN_INT = re.compile(r"0|[1-9][0-9]*")
+_YAML_WORDS = frozenset({"true", "false", "yes", "no", "on", "off", "null"})
+
+_FRONTMATTER_CACHE = {}
+_FRONTMATTER_CACHE_SIZE = 4096
+_FRONTMATTER_CACHE_LOCK = threading.Lock()
+
+
+def parse_flat_frontmatter(text: str):
+    """
+    Parse flat "key: value" frontmatter without YAML.
+
+    Only accepts the simple shapes save_chunks_as_markdown emits: unindented
+    keys with plain string or non-negative integer values. Anything that YAML
+    could interpret differently (quotes, booleans, dates, comments, nesting)
+    returns None so the caller can fall back to the YAML loader.
+
+    Args:
+        text: Frontmatter text between the --- markers
+
+    Returns:
+        Parsed dictionary, or None if the text is not simple flat frontmatter
+    """
+    result = {}
+    for line in text.splitlines():
+        match = _FLAT_LINE.fullmatch(line)
+        if not match:
+            return None
+        key, value = match.groups()
+        if not value:
+            result[key] = None
+        elif _PLAIN_INT.fullmatch(value):
+            result[key] = int(value)
+        elif (
+            "a" <= value[0].lower() <= "z"
+            and value.lower() not in _YAML_WORDS
+            and value == value.strip()
+            and ": " not in value
+            and " #" not in value
+            and "\t" not in value
+            and not value.endswith(":")
+        ):
+            result[key] = value
+        else:
+            return None
+    return result
+
+
 def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
     """Parse YAML frontmatter from markdown content."""
     if not content.startswith("---\n"):
@@ -24,69 +94,314 @@ def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
 
     try:
         # Split on the second --- boundary
-        parts = content.split("---\n", 2)
-        if len(parts) < 3:
+        end = content.find("---\n", 4)
+        if end == -1:
             return {}, content
 
-        frontmatter = yaml.safe_load(parts[1])
-        markdown_content = parts[2]
+        raw = content[4:end]
+        frontmatter = parse_flat_frontmatter(raw)
+        if frontmatter is None:
+            frontmatter = yaml.load(raw, Loader=_YAML_LOADER)
+        markdown_content = content[end + 4 :]
         return frontmatter or {}, markdown_content
     except yaml.YAMLError:
         return {}, content
 
 
+def read_source_file(file_path: Path) -> Tuple[str, Tuple[str, int, int]]:
+    """
+    Read a file as text.
+
+    Returns:
+        Tuple of (content, cache key of path, modification time and size)
+    """
+    stat = os.stat(file_path)
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    return content, (str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def parse_markdown(
+    content: str, cache_key: Optional[Tuple[str, int, int]] = None
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Parse the frontmatter of markdown content read by read_source_file.
+
+    Args:
+        content: File content
+        cache_key: Key memoizing the parsed frontmatter (None disables memoization)
+
+    Returns:
+        Tuple of (frontmatter, markdown content)
+    """
+    cached = _FRONTMATTER_CACHE.get(cache_key) if cache_key else None
+    if cached is not None:
+        frontmatter, offset = cached
+        return dict(frontmatter), content[offset:]
+
+    frontmatter, markdown_content = parse_frontmatter(content)
+    if cache_key:
+        with _FRONTMATTER_CACHE_LOCK:
+            if len(_FRONTMATTER_CACHE) >= _FRONTMATTER_CACHE_SIZE:
+                _FRONTMATTER_CACHE.pop(next(iter(_FRONTMATTER_CACHE)))
+            _FRONTMATTER_CACHE[cache_key] = (frontmatter, len(content) - len(markdown_content))
+    return dict(frontmatter), markdown_content
+
+
+def read_markdown_file(file_path: Path) -> Tuple[Dict[str, Any], str]:
+    """
+    Read a markdown file and parse its frontmatter.
+
+    Parsed frontmatter is memoized by path, modification time and size, so
+    files that are read again unchanged skip the frontmatter parse.
+
+    Args:
+        file_path: Path to the markdown file
+
+    Returns:
+        Tuple of (frontmatter, markdown content)
+    """
+    return parse_markdown(*read_source_file(file_path))
+
+
+_LEADING_WHITESPACE = re.compile(r"\s*")
+
+# Line starts that matter for section splitting: a # or ## heading (but not
+# ### or smaller), or a code fence (``` or ~~~, up to 3 spaces indented).
+# Anchoring on a literal newline lets the regex engine skip ahead to line
+# breaks instead of attempting a match at every character; the first line is
+# checked separately.
+_BOUNDARY = r"(?: {0,3}(?P<fence>`{3,}|~{3,})|#{1,2}[^\S\n])"
+_FIRST_LINE_BOUNDARY = re.compile(_BOUNDARY)
+_LINE_BOUNDARY = re.compile(r"\n" + _BOUNDARY)
+
+
+def section_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Find the (start, end) offsets of sections split on # and ## headings.
+
+    Scans the whole document in a single regex pass over line starts.
+    Headings inside fenced code blocks are ignored, so commented SQL such as
+    "## not a heading" stays in its section. Spans exclude surrounding
+    whitespace and empty sections are dropped.
+    """
+    boundaries = [0]
+    fence = None
+
+    first = _FIRST_LINE_BOUNDARY.match(text)
+    matches = _LINE_BOUNDARY.finditer(text)
+    if first:
+        matches = chain([first], matches)
+
+    for match in matches:
+        marker = match.group("fence")
+        if marker:
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+        elif fence is None:
+            # Skip the leading newline matched by _LINE_BOUNDARY
+            boundaries.append(match.start() if match is first else match.start() + 1)
+
+    boundaries.append(len(text))
+
+    spans = []
+    for start, end in zip(boundaries, boundaries[1:]):
+        start = _LEADING_WHITESPACE.match(text, start, end).end()
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if end > start:
+            spans.append((start, end))
+
+    return spans
+
+
 def split_on_headings(text: str) -> List[str]:
-    """Split text on # and ## headings, but not ### and smaller."""
-    lines = text.split("\n")
-    sections = []
-    current_section = []
-
-    for line in lines:
-        # Check if this line is a major heading (# or ##, but not ### or more)
-        if re.match(r"^#{1,2}(?!#)\s+", line):
-            # If we have content in current section, save it
-            if current_section:
-                sections.append("\n".join(current_section).strip())
-                current_section = []
-            # Start new section with this heading
-            current_section.append(line)
-        else:
-            # Add line to current section
-            current_section.append(line)
+    """Split text on # and ## headings, but not ### and smaller or inside code fences."""
+    return [text[start:end] for start, end in section_spans(text)]
+
+
+def split_oversized(text: str, chunk_size: int, chunks: List[str]) -> str:
+    """
+    Split an oversized chunk at paragraph or word breaks.
+
+    Walks the text by offset instead of re-slicing the remainder after every
+    split, so a large heading-less section is split in linear time.
+
+    Args:
+        text: Chunk text exceeding chunk_size by more than 20%
+        chunk_size: Target characters per chunk
+        chunks: List that completed chunks are appended to
+
+    Returns:
+        The remaining text, which fits within the 20% overage
+    """
+    limit = chunk_size * 1.2
+    stripped_end = len(text.rstrip())
+    pos = 0
+    end = len(text)
+
+    while end - pos > limit:
+        remaining = end - pos
+        split_point = chunk_size
+
+        # Look for paragraph breaks within reasonable range
+        index = text.find(
+            "\n\n",
+            pos + max(chunk_size - 200, 0),
+            pos + min(chunk_size + 201, remaining),
+        )
+        if index != -1:
+            split_point = index - pos
+
+        # If no good break found, split at word boundary
+        if split_point == chunk_size:
+            index = text.find(
+                " ",
+                pos + max(chunk_size - 50, 0),
+                pos + min(chunk_size + 50, remaining),
+            )
+            if index != -1:
+                split_point = index - pos
+
+        chunk_part = text[pos : pos + split_point].strip()
+        if chunk_part:
+            chunks.append(chunk_part)
+
+        # Continue with remainder, skipping the whitespace strip() would drop
+        pos = _LEADING_WHITESPACE.match(text, pos + split_point).end()
+        end = stripped_end
+
+    return text[pos:end]
+
+
+class Tokenizer(ABC):
+    """
+    Interface for measuring chunk sizes in tokens.
+
+    Subclasses implement count_tokens. Counts are assumed to be roughly
+    additive across concatenated pieces, which lets chunk_text measure each
+    section once instead of re-tokenizing the growing chunk.
+    """
 
-    # Add the final section
-    if current_section:
-        sections.append("\n".join(current_section).strip())
+    name = "tokenizer"
 
-    return [section for section in sections if section.strip()]
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        """Return the number of tokens in text."""
+
+
+class EstimatingTokenizer(Tokenizer):
+    """
+    Fast offline token estimate approximating a byte-pair encoder.
+
+    Words cost one token per 6 letters (a leading space merges into the word),
+    numbers one token per 3 digits, each punctuation character one token and
+    each run of line breaks one token. This is a rough approximation of
+    cl100k-style encoders that needs no vocabulary file.
+    """
+
+    name = "estimate"
+
+    _WORDS = re.compile(r"[^\W\d_]+")
+    _NUMBERS = re.compile(r"\d+")
+    _SYMBOLS = re.compile(r"[^\w\s]|_")
+    _LINE_BREAKS = re.compile(r"\n+")
+
+    def count_tokens(self, text: str) -> int:
+        return (
+            sum((len(word) + 5) // 6 for word in self._WORDS.findall(text))
+            + sum((len(number) + 2) // 3 for number in self._NUMBERS.findall(text))
+            + len(self._SYMBOLS.findall(text))
+            + len(self._LINE_BREAKS.findall(text))
+        )
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact token counts using a tiktoken encoding (requires the tiktoken package)."""
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        import tiktoken
+
+        self.name = f"tiktoken:{encoding_name}"
+        self.encoding_name = encoding_name
+        self._encoding = tiktoken.get_encoding(encoding_name)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self._encoding.encode_ordinary(text))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Encodings are not picklable; worker processes reload from tiktoken's cache
+        return {"encoding_name": self.encoding_name}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["encoding_name"])
+
+
+def get_tokenizer(name: str) -> Tokenizer:
+    """
+    Look up a tokenizer by name.
+
+    Args:
+        name: "estimate" or "tiktoken[:<encoding>]"
+
+    Returns:
+        Tokenizer instance
+    """
+    if name == "estimate":
+        return EstimatingTokenizer()
+    if name == "tiktoken" or name.startswith("tiktoken:"):
+        encoding_name = name.partition(":")[2] or "cl100k_base"
+        try:
+            return TiktokenTokenizer(encoding_name)
+        except ImportError:
+            raise ValueError(
+                "Tokenizer 'tiktoken' requires the tiktoken package (pip install tiktoken)"
+            )
+    raise ValueError(f"Unknown tokenizer: {name}")
 
 
 def chunk_text(
-    text: str, chunk_size: int = 5000, overlap: int = 200, min_chunk_size: int = 1000
+    text: str,
+    chunk_size: int = 5000,
+    overlap: int = 200,
+    min_chunk_size: int = 1000,
+    tokenizer: Tokenizer = None,
 ) -> List[str]:
     """
     Chunk text into pieces respecting heading boundaries.
 
     Args:
         text: Input text to chunk
-        chunk_size: Maximum characters per chunk (default 5000)
+        chunk_size: Maximum characters (or tokens) per chunk (default 5000)
         overlap: Characters to overlap between chunks (default 200)
-        min_chunk_size: Minimum characters per chunk (default 1000)
+        min_chunk_size: Minimum characters (or tokens) per chunk (default 1000)
+        tokenizer: If given, chunk_size and min_chunk_size are token budgets
+            measured with this tokenizer instead of character counts
 
     Returns:
         List of text chunks
     """
+    measure = tokenizer.count_tokens if tokenizer else len
+    separator_size = measure("\n\n")
+
     # First split on major headings (# and ##)
-    sections = split_on_headings(text)
+    spans = section_spans(text)
 
     chunks = []
     current_chunk = ""
+    # Size of current_chunk, tracked incrementally so each section is measured once
+    current_size = 0
+
+    for start, end in spans:
+        section = text[start:end]
+        section_size = measure(section)
 
-    for section in sections:
         # If adding this section would exceed chunk size, finalize current chunk
         if (
-            current_chunk and len(current_chunk) + len(section) + 2 > chunk_size
-        ):  # +2 for \n\n
+            current_chunk and current_size + section_size + separator_size > chunk_size
+        ):
             chunks.append(current_chunk.strip())
 
             # Start new chunk with overlap from previous chunk (word-based overlap)
@@ -98,45 +413,31 @@ def chunk_text(
                 if len(words) > 5:  # Only use overlap if we have enough words
                     overlap_text = " ".join(words[-5:])  # Use last 5 words
                     current_chunk = overlap_text + "\n\n" + section
+                    current_size = measure(overlap_text) + separator_size + section_size
                 else:
                     current_chunk = section
+                    current_size = section_size
             else:
                 current_chunk = section
+                current_size = section_size
         else:
             # Add section to current chunk
             if current_chunk:
                 current_chunk += "\n\n" + section
+                current_size += separator_size + section_size
             else:
                 current_chunk = section
+                current_size = section_size
 
         # If current chunk exceeds size significantly, split it at paragraph breaks
-        while (
-            len(current_chunk) > chunk_size * 1.2
-        ):  # Allow 20% overage before splitting
-            # Find a good split point (paragraph break)
-            split_point = chunk_size
-
-            # Look for paragraph breaks within reasonable range
-            for i in range(chunk_size - 200, min(chunk_size + 200, len(current_chunk))):
-                if i < len(current_chunk) - 1 and current_chunk[i : i + 2] == "\n\n":
-                    split_point = i
-                    break
-
-            # If no good break found, split at word boundary
-            if split_point == chunk_size:
-                for i in range(
-                    chunk_size - 50, min(chunk_size + 50, len(current_chunk))
-                ):
-                    if i < len(current_chunk) and current_chunk[i] == " ":
-                        split_point = i
-                        break
-
-            chunk_part = current_chunk[:split_point].strip()
-            if chunk_part:
-                chunks.append(chunk_part)
-
-            # Continue with remainder (with minimal overlap to avoid duplication)
-            current_chunk = current_chunk[split_point:].strip()
+        if current_size > chunk_size * 1.2:  # Allow 20% overage before splitting
+            if tokenizer:
+                # Convert the token budget to characters at this chunk's density
+                char_size = max(1, int(chunk_size * len(current_chunk) / current_size))
+                current_chunk = split_oversized(current_chunk, char_size, chunks)
+            else:
+                current_chunk = split_oversized(current_chunk, chunk_size, chunks)
+            current_size = measure(current_chunk)
 
     # Add final chunk
     if current_chunk.strip():
@@ -144,19 +445,23 @@ def chunk_text(
 
     # Filter out chunks that are too small or empty
     filtered_chunks = []
+    filtered_sizes = []
     for chunk in chunks:
-        if chunk.strip() and len(chunk.strip()) >= min_chunk_size:
-            filtered_chunks.append(chunk.strip())
-        elif chunk.strip():
-            # For very small chunks, try to merge with previous chunk if possible
-            if (
-                filtered_chunks
-                and len(filtered_chunks[-1]) + len(chunk) < chunk_size * 1.2
-            ):
-                filtered_chunks[-1] += "\n\n" + chunk.strip()
-            # Otherwise, only keep if it's a complete section (has a heading)
-            elif chunk.strip().startswith("#"):
-                filtered_chunks.append(chunk.strip())
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        size = measure(chunk)
+        if size >= min_chunk_size:
+            filtered_chunks.append(chunk)
+            filtered_sizes.append(size)
+        # For very small chunks, try to merge with previous chunk if possible
+        elif filtered_chunks and filtered_sizes[-1] + size < chunk_size * 1.2:
+            filtered_chunks[-1] += "\n\n" + chunk
+            filtered_sizes[-1] += separator_size + size
+        # Otherwise, only keep if it's a complete section (has a heading)
+        elif chunk.startswith("#"):
+            filtered_chunks.append(chunk)
+            filtered_sizes.append(size)
 
     return filtered_chunks
 
@@ -166,29 +471,31 @@ def process_document(
     chunk_size: int = 5000,
     overlap: int = 200,
     min_chunk_size: int = 1000,
+    tokenizer: Tokenizer = None,
 ) -> List[Dict[str, Any]]:
     """
     Process a single markdown document and return chunks.
 
     Args:
         file_path: Path to the markdown file
+        tokenizer: If given, sizes are token budgets (see chunk_text)
 
     Returns:
         List of dictionaries containing chunk data
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Parse frontmatter and content
-        frontmatter, markdown_content = parse_frontmatter(content)
+        # Read and parse frontmatter and content
+        frontmatter, markdown_content = read_markdown_file(file_path)
 
         # If document is smaller than minimum chunk size, don't chunk it
-        if len(markdown_content.strip()) < min_chunk_size:
+        measure = tokenizer.count_tokens if tokenizer else len
+        if measure(markdown_content.strip()) < min_chunk_size:
             chunks = [markdown_content.strip()] if markdown_content.strip() else []
         else:
             # Generate chunks
-            chunks = chunk_text(markdown_content, chunk_size, overlap, min_chunk_size)
+            chunks = chunk_text(
+                markdown_content, chunk_size, overlap, min_chunk_size, tokenizer
+            )
 
         # Create chunk documents
         chunk_docs = []
@@ -212,60 +519,393 @@ def process_document(
         return []
 
 
-def process_directory(
+def find_markdown_files(docs_dir: str = None) -> List[Path]:
+    """
+    List the markdown files to chunk in a directory.
+
+    Files are returned in a stable (sorted) order so that serial, parallel and
+    incremental runs produce identical output. README.md is skipped.
+    """
+    if docs_dir is None:
+        docs_dir = Path(__file__).parent
+    else:
+        docs_dir = Path(docs_dir)
+
+    return sorted(
+        md_file for md_file in docs_dir.glob("*.md") if md_file.name != "README.md"
+    )
+
+
+def iter_chunks(
     docs_dir: str = None,
     chunk_size: int = 5000,
     overlap: int = 200,
     min_chunk_size: int = 1000,
-) -> List[Dict[str, Any]]:
+    workers: int = 1,
+    tokenizer: Tokenizer = None,
+) -> Iterator[Dict[str, Any]]:
     """
-    Process all markdown files in the flink_docs directory.
+    Lazily yield chunk documents for all markdown files in a directory.
+
+    Chunks are yielded as soon as their source file is processed, so a large
+    corpus can be written out or published in constant memory.
 
     Args:
         docs_dir: Directory containing markdown files (defaults to current script directory)
+        workers: Number of worker processes (1 processes files serially)
 
-    Returns:
-        List of all chunk documents
+    Yields:
+        Chunk documents in file order
     """
-    if docs_dir is None:
-        docs_dir = Path(__file__).parent
-    else:
-        docs_dir = Path(docs_dir)
+    md_files = find_markdown_files(docs_dir)
 
-    all_chunks = []
+    chunk_count = 0
     processed_count = 0
 
-    # Process all .md files except README.md
-    for md_file in docs_dir.glob("*.md"):
-        if md_file.name == "README.md":
-            continue
-
+    for md_file, chunks in _iter_processed(
+        md_files, chunk_size, overlap, min_chunk_size, workers, tokenizer
+    ):
         print(f"Processing: {md_file.name}")
-        chunks = process_document(md_file, chunk_size, overlap, min_chunk_size)
-        all_chunks.extend(chunks)
         processed_count += 1
 
         if chunks:
             print(f"  → Generated {len(chunks)} chunks")
 
+        chunk_count += len(chunks)
+        yield from chunks
+
     print(
-        f"\nTotal: Processed {processed_count} documents, generated {len(all_chunks)} chunks"
+        f"\nTotal: Processed {processed_count} documents, generated {chunk_count} chunks"
     )
-    return all_chunks
 
 
-def save_chunks_as_markdown(chunks: List[Dict[str, Any]], output_dir: str):
-    """Save chunks as individual markdown files."""
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
+def process_directory(
+    docs_dir: str = None,
+    chunk_size: int = 5000,
+    overlap: int = 200,
+    min_chunk_size: int = 1000,
+    workers: int = 1,
+    tokenizer: Tokenizer = None,
+) -> List[Dict[str, Any]]:
+    """
+    Process all markdown files in the flink_docs directory.
+
+    Args:
+        docs_dir: Directory containing markdown files (defaults to current script directory)
+        workers: Number of worker processes (1 processes files serially)
+
+    Returns:
+        List of all chunk documents
+    """
+    return list(
+        iter_chunks(docs_dir, chunk_size, overlap, min_chunk_size, workers, tokenizer)
+    )
+
+
+def _process_batch(
+    process: Callable[[Path], List[Dict[str, Any]]], files: List[Path]
+) -> List[List[Dict[str, Any]]]:
+    return [process(md_file) for md_file in files]
+
+
+def _iter_processed(
+    md_files: List[Path],
+    chunk_size: int,
+    overlap: int,
+    min_chunk_size: int,
+    workers: int,
+    tokenizer: Tokenizer = None,
+) -> Iterator[Tuple[Path, List[Dict[str, Any]]]]:
+    """
+    Yield (file, chunks) pairs in input order, fanning out across processes if requested.
+
+    Files are submitted to the pool in batches, and at most workers * 2
+    batches are queued or running at once; results are yielded in
+    submission order, so output is identical to the serial path. A slow
+    consumer holds back the workers instead of letting results pile up, so
+    memory stays bounded by the window rather than the corpus.
+    """
+    process = partial(
+        process_document,
+        chunk_size=chunk_size,
+        overlap=overlap,
+        min_chunk_size=min_chunk_size,
+        tokenizer=tokenizer,
+    )
+
+    if workers <= 1 or len(md_files) <= 1:
+        for md_file in md_files:
+            yield md_file, process(md_file)
+        return
+
+    # Batch small files per task to amortize pickling/IPC overhead
+    batch = max(1, min(64, len(md_files) // (workers * 4)))
+    batches = [md_files[i : i + batch] for i in range(0, len(md_files), batch)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for files in batches:
+            pending.append((files, executor.submit(_process_batch, process, files)))
+            if len(pending) >= workers * 2:
+                files, future = pending.popleft()
+                yield from zip(files, future.result())
+        while pending:
+            files, future = pending.popleft()
+            yield from zip(files, future.result())
+
+
+_SHINGLE_WORDS = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+_EMPTY_BIN = _MASK64
+
+
+def minhash_signature(
+    text: str, num_perm: int = 128, shingle_size: int = 5
+) -> Optional[array]:
+    """
+    Compute a MinHash signature over word shingles of a text.
+
+    Uses one-permutation hashing: each shingle is hashed once and assigned
+    to one of num_perm bins, keeping the minimum per bin, and empty bins are
+    filled from the next non-empty bin (rotation densification). This costs
+    O(shingles) per text instead of O(shingles * num_perm) for classic
+    MinHash while estimating Jaccard similarity the same way.
+
+    Args:
+        text: Text to sign
+        num_perm: Signature length
+        shingle_size: Number of consecutive words per shingle
+
+    Returns:
+        Signature array, or None if the text has fewer words than a shingle
+    """
+    words = [zlib.crc32(word.encode()) for word in _SHINGLE_WORDS.findall(text.lower())]
+    if len(words) < shingle_size:
+        return None
+
+    signature = array("Q", [_EMPTY_BIN]) * num_perm
+    for shingle in set(zip(*(words[i:] for i in range(shingle_size)))):
+        # Tuples of ints hash deterministically; spread the bits before binning
+        h = (hash(shingle) * 0x9E3779B97F4A7C15) & _MASK64
+        slot = h % num_perm
+        value = h // num_perm
+        if value < signature[slot]:
+            signature[slot] = value
+
+    # Densify: empty bins borrow from the next non-empty bin to the right,
+    # offset by the distance so borrowed values stay distinguishable
+    filled = [i for i in range(num_perm) if signature[i] != _EMPTY_BIN]
+    if len(filled) < num_perm:
+        next_filled = filled[0] + num_perm
+        for i in range(num_perm - 1, -1, -1):
+            if signature[i] != _EMPTY_BIN:
+                next_filled = i
+            else:
+                source = signature[next_filled % num_perm]
+                signature[i] = (source + (next_filled - i)) & _MASK64
+    return signature
+
+
+def lsh_rows(threshold: float, num_perm: int = 128) -> int:
+    """
+    Pick the rows per LSH band for a similarity threshold.
+
+    With b bands of r rows, pairs of similarity s share a band with
+    probability 1 - (1 - s^r)^b, an S-curve that is steepest near
+    (1/b)^(1/r). The divisor r of num_perm whose midpoint is closest to
+    threshold without exceeding it is chosen, so pairs at the threshold are
+    likely to become candidates and misses stay rare; candidates are then
+    checked against the threshold exactly.
+
+    Args:
+        threshold: Jaccard similarity threshold
+        num_perm: MinHash signature length
+
+    Returns:
+        Rows per band
+    """
+    options = [
+        ((1 / (num_perm // rows)) ** (1 / rows), rows)
+        for rows in range(1, num_perm + 1)
+        if num_perm % rows == 0
+    ]
+    below = [option for option in options if option[0] <= threshold]
+    if below:
+        return max(below)[1]
+    return min(options)[1]
+
+
+class NearDuplicateFilter:
+    """
+    Online near-duplicate detector using MinHash signatures and LSH banding.
+
+    Each chunk's signature is split into bands; chunks sharing any band land
+    in the same bucket and only those candidates are compared, so detection
+    is sub-quadratic in the number of chunks. The first occurrence of a
+    near-duplicate group is kept.
+    """
+
+    def __init__(
+        self, threshold: float = 0.8, num_perm: int = 128, rows: Optional[int] = None
+    ):
+        """
+        Initialize the filter.
+
+        Args:
+            threshold: Estimated Jaccard similarity at or above which chunks are duplicates
+            num_perm: MinHash signature length
+            rows: Signature rows per LSH band (num_perm must be divisible by
+                rows); derived from threshold by lsh_rows if not given
+        """
+        if rows is None:
+            rows = lsh_rows(threshold, num_perm)
+        if num_perm % rows:
+            raise ValueError("num_perm must be divisible by rows")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = rows
+        self._buckets = {}
+        self._signatures = []
+        self._ids = []
+
+    def _similarity(self, a: array, b: array) -> float:
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    def check(self, document_id: str, text: str) -> Optional[str]:
+        """
+        Check a chunk against previously seen chunks and index it if unique.
+
+        Args:
+            document_id: ID of the chunk
+            text: Chunk text
+
+        Returns:
+            ID of the earlier near-duplicate, or None if the chunk is unique
+        """
+        signature = minhash_signature(text, self.num_perm)
+        if signature is None:
+            return None
+
+        bands = [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.num_perm // self.rows)
+        ]
+
+        seen = set()
+        for key in bands:
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if self._similarity(signature, self._signatures[candidate]) >= self.threshold:
+                    return self._ids[candidate]
+
+        index = len(self._ids)
+        self._ids.append(document_id)
+        self._signatures.append(signature)
+        for key in bands:
+            self._buckets.setdefault(key, []).append(index)
+        return None
+
+
+def dedup_chunks(
+    chunks: Iterable[Dict[str, Any]], threshold: float = 0.8
+) -> Iterator[Dict[str, Any]]:
+    """
+    Drop near-duplicate chunks from a chunk stream.
+
+    The surviving chunks of each source document are renumbered so that
+    chunk_index and total_chunks stay contiguous; document_id is left as
+    is, so IDs remain stable across runs with and without deduplication.
+    Duplicates are dropped, not merged into the chunk they repeat.
+
+    Args:
+        chunks: Chunk documents, grouped by source document in chunk order
+        threshold: Estimated Jaccard similarity at or above which chunks are duplicates
+
+    Yields:
+        Chunk documents that are not near-duplicates of an earlier chunk
+    """
+    near_duplicates = NearDuplicateFilter(threshold)
+    dropped = 0
+    kept: List[Dict[str, Any]] = []
+
+    def renumbered() -> List[Dict[str, Any]]:
+        for index, chunk in enumerate(kept, 1):
+            chunk["chunk_index"] = index
+            chunk["total_chunks"] = len(kept)
+        return kept
 
     for chunk in chunks:
-        # Create filename from document_id
-        filename = f"{chunk['document_id']}.md"
-        filepath = output_path / filename
+        if chunk["chunk_index"] == 1 and kept:
+            # A new source document starts
+            yield from renumbered()
+            kept = []
+
+        duplicate_of = near_duplicates.check(chunk["document_id"], chunk["chunk_text"])
+        if duplicate_of:
+            print(f"  ✗ Dropped {chunk['document_id']} (near-duplicate of {duplicate_of})")
+            dropped += 1
+        else:
+            kept.append(chunk)
+
+    yield from renumbered()
+    print(f"Dropped {dropped} near-duplicate chunks")
+
+
+def json_serializer(obj):
+    """JSON serializer for datetime objects."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
 
-        # Create markdown content with metadata header
-        content = f"""---
+class ChunkFileWriter:
+    """
+    Stream chunk documents to a file one at a time.
+
+    Writes JSON Lines (one chunk per line) by default. Paths ending in .json
+    get the indented JSON array format, emitted element by element.
+    """
+
+    def __init__(self, output_file: str):
+        self.output_file = output_file
+        self.as_array = str(output_file).endswith(".json")
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> "ChunkFileWriter":
+        self._file = open(self.output_file, "w", encoding="utf-8")
+        return self
+
+    def write(self, chunk: Dict[str, Any]) -> None:
+        """Append a single chunk document."""
+        if self.as_array:
+            encoded = json.dumps(
+                chunk, indent=2, ensure_ascii=False, default=json_serializer
+            )
+            self._file.write("[\n  " if self.count == 0 else ",\n  ")
+            self._file.write(encoded.replace("\n", "\n  "))
+        else:
+            self._file.write(
+                json.dumps(chunk, ensure_ascii=False, default=json_serializer)
+            )
+            self._file.write("\n")
+        self.count += 1
+
+    def __exit__(self, *exc_info) -> None:
+        if self.as_array:
+            self._file.write("\n]" if self.count else "[]")
+        self._file.close()
+
+
+def save_chunk_as_markdown(chunk: Dict[str, Any], output_path: Path) -> None:
+    """Save a single chunk as a markdown file with a metadata header."""
+    # Create filename from document_id
+    filename = f"{chunk['document_id']}.md"
+    filepath = output_path / filename
+
+    # Create markdown content with metadata header
+    content = f"""---
 document_id: {chunk['document_id']}
 source_file: {chunk['source_file']}
 source_url: {chunk['source_url']}
@@ -277,10 +917,293 @@ total_chunks: {chunk['total_chunks']}
 {chunk['chunk_text']}
 """
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def save_chunks_as_markdown(chunks: Iterable[Dict[str, Any]], output_dir: str):
+    """Save chunks as individual markdown files."""
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+
+    count = 0
+    for chunk in chunks:
+        save_chunk_as_markdown(chunk, output_path)
+        count += 1
+
+    print(f"Saved {count} markdown files to {output_dir}")
+
+
+# Chunk store layout:
+#   magic | record* | index | trailer [| record* | index | trailer]*
+# Each record is a 4-byte little-endian length followed by the chunk as
+# compact JSON. The index is a JSON object mapping document_id to
+# [offset, length] and the trailer holds the index offset and an end marker.
+# Appends never modify existing bytes: they add records, then a new full
+# index and trailer. Readers use the last complete trailer, so an
+# interrupted append leaves the previous index readable.
+STORE_MAGIC = b"CHUNKS01"
+STORE_TRAILER_MAGIC = b"CHUNKIDX"
+_STORE_LENGTH = struct.Struct("<I")
+_STORE_TRAILER = struct.Struct("<Q8s")
+
+
+class ChunkStoreWriter:
+    """
+    Write chunk documents to a single-file, append-only chunk store.
+
+    Opening an existing store with append=True keeps its records and index;
+    new records for an existing document_id replace the old ones in the index.
+    Appended records, index and trailer are written after the existing
+    trailer, so the store stays readable if the append is interrupted.
+    """
+
+    def __init__(self, store_file: str, append: bool = False):
+        self.store_file = store_file
+        self.append = append
+        self.count = 0
+        self._index = {}
+        self._file = None
+
+    def __enter__(self) -> "ChunkStoreWriter":
+        if self.append and os.path.exists(self.store_file):
+            with ChunkStore(self.store_file) as store:
+                self._index = dict(store.index)
+            # Append only; the old index and trailer stay valid until the new ones land
+            self._file = open(self.store_file, "ab")
+        else:
+            self._file = open(self.store_file, "wb")
+            self._file.write(STORE_MAGIC)
+        return self
+
+    def write(self, chunk: Dict[str, Any]) -> None:
+        """Append a single chunk document."""
+        record = json.dumps(
+            chunk, ensure_ascii=False, separators=(",", ":"), default=json_serializer
+        ).encode("utf-8")
+        offset = self._file.tell()
+        self._file.write(_STORE_LENGTH.pack(len(record)))
+        self._file.write(record)
+        self._index[chunk["document_id"]] = [offset + _STORE_LENGTH.size, len(record)]
+        self.count += 1
+
+    def __exit__(self, *exc_info) -> None:
+        index_offset = self._file.tell()
+        self._file.write(json.dumps(self._index, separators=(",", ":")).encode("utf-8"))
+        self._file.write(_STORE_TRAILER.pack(index_offset, STORE_TRAILER_MAGIC))
+        self._file.close()
+
+
+class ChunkStore:
+    """
+    Memory-mapped reader for a chunk store.
+
+    Only the index is decoded on open; chunk records are sliced from the
+    mapping and decoded on access, so lookups by document_id are O(1) and
+    iterating a store never opens or parses per-chunk files.
+    """
+
+    def __init__(self, store_file: str):
+        self.store_file = store_file
+        with open(store_file, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._mmap)
+        if (
+            size < len(STORE_MAGIC) + _STORE_TRAILER.size
+            or self._mmap[: len(STORE_MAGIC)] != STORE_MAGIC
+        ):
+            self._mmap.close()
+            raise ValueError(f"Not a chunk store: {store_file}")
+
+        found = self._last_index(size)
+        if found is None:
+            self._mmap.close()
+            raise ValueError(f"Chunk store is incomplete (missing index): {store_file}")
+        self.index_offset, self.index = found
+
+    def _last_index(self, end: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Find the last complete index at or before end.
+
+        A store whose last append was interrupted ends in partial records;
+        the search then falls back to the trailer of the previous write.
+
+        Returns:
+            Tuple of (index offset, index), or None if there is none
+        """
+        while end >= len(STORE_MAGIC) + _STORE_TRAILER.size:
+            marker_at = self._mmap.rfind(STORE_TRAILER_MAGIC, len(STORE_MAGIC), end)
+            if marker_at < 0:
+                return None
+            trailer_end = marker_at + len(STORE_TRAILER_MAGIC)
+            trailer_start = trailer_end - _STORE_TRAILER.size
+            if trailer_start >= len(STORE_MAGIC):
+                index_offset, _ = _STORE_TRAILER.unpack_from(self._mmap, trailer_start)
+                if len(STORE_MAGIC) <= index_offset <= trailer_start:
+                    try:
+                        index = json.loads(
+                            self._mmap[index_offset:trailer_start].decode("utf-8")
+                        )
+                    except ValueError:
+                        index = None
+                    if isinstance(index, dict):
+                        return index_offset, index
+            # The marker bytes were inside a record or partial write; keep looking
+            end = marker_at + len(STORE_TRAILER_MAGIC) - 1
+        return None
+
+    def __enter__(self) -> "ChunkStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self.index
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for offset, length in self.index.values():
+            yield json.loads(self._mmap[offset : offset + length].decode("utf-8"))
+
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Return the chunk with the given document_id, or None if absent."""
+        entry = self.index.get(document_id)
+        if entry is None:
+            return None
+        offset, length = entry
+        return json.loads(self._mmap[offset : offset + length].decode("utf-8"))
+
+    def close(self) -> None:
+        """Unmap the store file."""
+        self._mmap.close()
+
+
+MANIFEST_NAME = ".chunk_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Any]:
+    """Load a chunk manifest, returning an empty one if missing or unreadable."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "params": {}, "files": {}}
+
+
+def save_manifest(manifest: Dict[str, Any], manifest_path: Path) -> None:
+    """Atomically write a chunk manifest."""
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def hash_file(file_path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def rechunk_incremental(
+    docs_dir: str = None,
+    output_dir: str = None,
+    chunk_size: int = 5000,
+    overlap: int = 200,
+    min_chunk_size: int = 1000,
+    workers: int = 1,
+    tokenizer: Tokenizer = None,
+) -> Dict[str, int]:
+    """
+    Re-chunk only the source files that changed since the last run.
+
+    A manifest in the output directory records each source file's content
+    hash, the chunking parameters and the chunk IDs it produced. Unchanged
+    files are skipped and their chunk files left untouched; chunk files that
+    are no longer produced (removed sources, or documents that now yield
+    fewer chunks) are deleted. Changing the chunking parameters re-chunks
+    everything.
+
+    Args:
+        docs_dir: Directory containing markdown files (defaults to current script directory)
+        output_dir: Directory holding the chunk markdown files and manifest
+        workers: Number of worker processes (1 processes files serially)
+
+    Returns:
+        Dictionary with unchanged/rechunked/removed/deleted_chunks counts
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    manifest_path = output_path / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    old_files = manifest["files"]
+
+    params = {
+        "chunk_size": chunk_size,
+        "overlap": overlap,
+        "min_chunk_size": min_chunk_size,
+        "tokenizer": tokenizer.name if tokenizer else None,
+    }
+    previous = old_files if manifest["params"] == params else {}
+    stale_ids = {
+        chunk_id
+        for entry in old_files.values()
+        for chunk_id in entry["chunk_ids"]
+    }
+
+    files = {}
+    changed = []
+    for md_file in find_markdown_files(docs_dir):
+        digest = hash_file(md_file)
+        entry = previous.get(md_file.name)
+        if (
+            entry
+            and entry["sha256"] == digest
+            and all((output_path / f"{cid}.md").exists() for cid in entry["chunk_ids"])
+        ):
+            files[md_file.name] = entry
+        else:
+            files[md_file.name] = {"sha256": digest, "chunk_ids": []}
+            changed.append(md_file)
 
-    print(f"Saved {len(chunks)} markdown files to {output_dir}")
+    for md_file, chunks in _iter_processed(
+        changed, chunk_size, overlap, min_chunk_size, workers, tokenizer
+    ):
+        print(f"Processing: {md_file.name}")
+        for chunk in chunks:
+            save_chunk_as_markdown(chunk, output_path)
+        files[md_file.name]["chunk_ids"] = [chunk["document_id"] for chunk in chunks]
+        if chunks:
+            print(f"  → Generated {len(chunks)} chunks")
+
+    # Delete chunk files that no current source produces
+    live_ids = {chunk_id for entry in files.values() for chunk_id in entry["chunk_ids"]}
+    orphaned = stale_ids - live_ids
+    for chunk_id in orphaned:
+        (output_path / f"{chunk_id}.md").unlink(missing_ok=True)
+
+    manifest["params"] = params
+    manifest["files"] = files
+    save_manifest(manifest, manifest_path)
+
+    stats = {
+        "unchanged": len(files) - len(changed),
+        "rechunked": len(changed),
+        "removed": len(set(old_files) - set(files)),
+        "deleted_chunks": len(orphaned),
+    }
+    print(
+        f"\nTotal: {stats['rechunked']} documents re-chunked, {stats['unchanged']} unchanged, "
+        f"{stats['removed']} removed, {stats['deleted_chunks']} orphaned chunk files deleted"
+    )
+    return stats
 
 
 def main():
@@ -289,10 +1212,22 @@ def main():
 
     parser = argparse.ArgumentParser(description="Chunk Flink documentation")
     parser.add_argument("--docs-dir", help="Directory containing markdown files")
-    parser.add_argument("--output", help="Output file for chunks (JSON format)")
+    parser.add_argument(
+        "--output",
+        help="Output file for chunks (JSON Lines; a .json path writes a JSON array)",
+    )
     parser.add_argument(
         "--output-md-dir", help="Output directory for individual markdown files"
     )
+    parser.add_argument(
+        "--output-store",
+        help="Output file for a single-file chunk store (memory-mapped, indexed by document_id)",
+    )
+    parser.add_argument(
+        "--append-store",
+        action="store_true",
+        help="Append to an existing --output-store instead of overwriting it",
+    )
     parser.add_argument(
         "--chunk-size", type=int, default=5000, help="Chunk size in characters"
     )
@@ -305,39 +1240,113 @@ def main():
         default=1000,
         help="Minimum chunk size in characters",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for chunking (default 1, 0 = all CPUs)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-chunk source files changed since the last run (requires --output-md-dir)",
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        help="Drop chunks whose estimated Jaccard similarity to an earlier chunk "
+        "is at least this value (e.g. 0.8)",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        help="Size chunks in tokens instead of characters using this tokenizer "
+        "('estimate' for the offline estimator, or 'tiktoken[:<encoding>]'); "
+        "--chunk-size and --min-chunk-size are then token budgets",
+    )
 
     args = parser.parse_args()
+    if args.incremental and (
+        args.output or args.output_store or not args.output_md_dir
+    ):
+        parser.error(
+            "--incremental requires --output-md-dir and cannot be used with "
+            "--output or --output-store"
+        )
 
-    # Process documents
-    chunks = process_directory(
-        args.docs_dir, args.chunk_size, args.overlap, args.min_chunk_size
-    )
+    if args.dedup_threshold is not None and args.incremental:
+        parser.error("--dedup-threshold cannot be used with --incremental")
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    tokenizer = None
+    if args.tokenizer:
+        try:
+            tokenizer = get_tokenizer(args.tokenizer)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.incremental:
+        rechunk_incremental(
+            args.docs_dir,
+            args.output_md_dir,
+            args.chunk_size,
+            args.overlap,
+            args.min_chunk_size,
+            workers,
+            tokenizer,
+        )
+        return
 
-    # Optionally save to file
-    if args.output:
-        import json
-        from datetime import datetime
-
-        def json_serializer(obj):
-            """JSON serializer for datetime objects."""
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            raise TypeError(
-                f"Object of type {obj.__class__.__name__} is not JSON serializable"
+    output_path = None
+    if args.output_md_dir:
+        output_path = Path(args.output_md_dir)
+        output_path.mkdir(exist_ok=True)
+
+    chunks = iter_chunks(
+        args.docs_dir,
+        args.chunk_size,
+        args.overlap,
+        args.min_chunk_size,
+        workers,
+        tokenizer,
+    )
+    if args.dedup_threshold is not None:
+        chunks = dedup_chunks(chunks, args.dedup_threshold)
+
+    # Stream chunks to the requested outputs as they are produced
+    sample = None
+    md_count = 0
+    with ExitStack() as stack:
+        writer = None
+        if args.output:
+            writer = stack.enter_context(ChunkFileWriter(args.output))
+        store_writer = None
+        if args.output_store:
+            store_writer = stack.enter_context(
+                ChunkStoreWriter(args.output_store, append=args.append_store)
             )
 
-        with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(chunks, f, indent=2, ensure_ascii=False, default=json_serializer)
-        print(f"Saved {len(chunks)} chunks to {args.output}")
-
-    # Optionally save as markdown files
-    if args.output_md_dir:
-        save_chunks_as_markdown(chunks, args.output_md_dir)
+        for chunk in chunks:
+            if sample is None:
+                sample = chunk
+            if writer:
+                writer.write(chunk)
+            if store_writer:
+                store_writer.write(chunk)
+            if output_path:
+                save_chunk_as_markdown(chunk, output_path)
+                md_count += 1
+
+    if writer:
+        print(f"Saved {writer.count} chunks to {args.output}")
+    if store_writer:
+        print(f"Saved {store_writer.count} chunks to store {args.output_store}")
+    if output_path:
+        print(f"Saved {md_count} markdown files to {args.output_md_dir}")
 
     # Print sample
-    if chunks:
+    if sample:
         print("\nSample chunk:")
-        sample = chunks[0]
         print(f"Document ID: {sample['document_id']}")
         print(f"Source: {sample['source_file']}")
         print(f"Chunk {sample['chunk_index']}/{sample['total_chunks']}")
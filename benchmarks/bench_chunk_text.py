@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for chunk_documents.chunk_text.
+
+Chunks synthetic heading-less sections of increasing size and reports the time
+per megabyte. With linear-time splitting the per-MB cost stays flat as the
+input grows; a quadratic implementation roughly doubles it at each step.
+
+Usage:
+    python benchmarks/bench_chunk_text.py
+    python benchmarks/bench_chunk_text.py --sizes 1 2 4 8 16 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "assets/lab2/flink_docs"))
+
+from chunk_documents import chunk_text  # noqa: E402
+
+WORDS = "flink stream table window watermark join kafka schema state checkpoint".split()
+
+
+def make_section(size_bytes: int, seed: int = 0) -> str:
+    """Build a heading-less section of roughly size_bytes with sparse paragraph breaks."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size_bytes:
+        word = rng.choice(WORDS)
+        sep = "\n\n" if rng.random() < 0.002 else " "
+        parts.append(word + sep)
+        length += len(word) + len(sep)
+    return "".join(parts)
+
+
+def time_chunking(text: str, repeat: int) -> float:
+    """Return the best wall-clock time over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunk_text(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark chunk_text scaling")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 2, 4, 8], help="Input sizes in MB"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size")
+    args = parser.parse_args()
+
+    print(f"{'size (MB)':>10} {'time (s)':>10} {'s/MB':>10} {'MB/s':>10}")
+    baseline = None
+    for size in args.sizes:
+        text = make_section(size * 1024 * 1024)
+        elapsed = time_chunking(text, args.repeat)
+        per_mb = elapsed / size
+        baseline = baseline or per_mb
+        print(f"{size:>10} {elapsed:>10.3f} {per_mb:>10.4f} {size / elapsed:>10.1f}")
+
+    print(
+        f"\nPer-MB cost at largest size is {per_mb / baseline:.2f}x the smallest "
+        "(~1.0x means linear scaling)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Lab2 document ingestion path.
+
+Generates a synthetic markdown corpus and measures each ingestion stage:
+- split_on_headings: section scanning per document
+- chunk_text: full chunking per document
+- parse_markdown_file: FlinkDocsPublisher file read + frontmatter parse
+- avro_serialize: Avro encoding of key and value as done on produce
+
+For every stage it reports throughput (MB/s, items/s), per-item latency
+percentiles and the peak Python allocations during the stage, traced with
+tracemalloc. Results can be saved as JSON and compared against an
+earlier run to spot regressions.
+
+Usage:
+    python benchmarks/bench_ingestion.py
+    python benchmarks/bench_ingestion.py --docs 2000 --doc-size 20 --code-ratio 0.3
+    python benchmarks/bench_ingestion.py --output results.json --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.common.chunker import load_chunker  # noqa: E402
+
+WORDS = (
+    "flink stream table window watermark join kafka schema state checkpoint "
+    "query event time aggregate partition topic changelog upsert connector"
+).split()
+
+
+def make_corpus(
+    docs: int,
+    doc_size_kb: float,
+    heading_density: float,
+    code_ratio: float,
+    seed: int = 0,
+) -> List[str]:
+    """
+    Generate synthetic markdown documents with flat frontmatter.
+
+    Args:
+        docs: Number of documents
+        doc_size_kb: Average document size in KB
+        heading_density: Average # / ## headings per KB of text
+        code_ratio: Fraction of paragraphs that are fenced SQL code blocks
+        seed: Random seed for reproducible corpora
+
+    Returns:
+        List of document contents
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(docs):
+        target = int(rng.uniform(0.5, 1.5) * doc_size_kb * 1024)
+        parts = [
+            f"---\ndocument_id: synthetic_{i}\ntitle: Synthetic document {i}\n"
+            f"source_url: https://example.com/docs/{i}\n---\n"
+        ]
+        size = 0
+        while size < target:
+            if rng.random() < heading_density * 0.4:  # ~400 byte paragraphs
+                part = f"{rng.choice(['#', '##', '###'])} {rng.choice(WORDS).title()}"
+            elif rng.random() < code_ratio:
+                part = (
+                    "```sql\n-- # comment that looks like a heading\n"
+                    f"SELECT {rng.choice(WORDS)} FROM {rng.choice(WORDS)} "
+                    f"WHERE {rng.choice(WORDS)} > {rng.randint(0, 100)};\n```"
+                )
+            else:
+                part = " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 100)))
+            parts.append(part)
+            size += len(part) + 2
+        corpus.append("\n\n".join(parts) + "\n")
+    return corpus
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_stage(
+    items: List[Any],
+    func: Callable[[Any], Any],
+    item_bytes: Callable[[Any], int],
+    count_outputs: Callable[[Any], int] = lambda result: 1,
+    setup: Callable[[], None] = lambda: None,
+) -> Dict[str, float]:
+    """
+    Time func over every item, then re-run under tracemalloc for memory.
+
+    Args:
+        items: Inputs to the stage
+        func: Stage function applied to each item
+        item_bytes: Input size of an item in bytes
+        count_outputs: Number of outputs (e.g. chunks) produced by a call
+        setup: Called before each pass, e.g. to clear caches
+
+    Returns:
+        Stage metrics: throughput, latency percentiles (ms) and peak allocations
+    """
+    setup()
+    latencies = []
+    outputs = 0
+    total_bytes = 0
+    start = time.perf_counter()
+    for item in items:
+        item_start = time.perf_counter()
+        result = func(item)
+        latencies.append(time.perf_counter() - item_start)
+        outputs += count_outputs(result)
+        total_bytes += item_bytes(item)
+    elapsed = time.perf_counter() - start
+
+    # Separate pass so tracemalloc overhead does not skew timings
+    setup()
+    tracemalloc.start()
+    for item in items:
+        func(item)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "items": len(items),
+        "outputs": outputs,
+        "seconds": elapsed,
+        "mb_per_s": total_bytes / (1024 * 1024) / elapsed if elapsed else 0.0,
+        "items_per_s": len(items) / elapsed if elapsed else 0.0,
+        "outputs_per_s": outputs / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "peak_traced_mb": traced_peak / (1024 * 1024),
+    }
+
+
+def make_avro_encoder(publisher) -> Callable[[Dict[str, Any]], bytes]:
+    """
+    Build the per-message encode used by the publisher's SerializingProducer.
+
+    Key and value go through the publisher's CachedAvroSerializer with
+    schema IDs from an in-process registry.
+    """
+    from confluent_kafka.serialization import MessageField, SerializationContext
+
+    from scripts.common.mock_kafka import MockSchemaRegistryClient
+    from scripts.common.serialization import CachedAvroSerializer
+
+    registry = MockSchemaRegistryClient()
+    key_serializer = CachedAvroSerializer(registry, publisher.key_schema)
+    value_serializer = CachedAvroSerializer(registry, publisher.value_schema)
+    key_ctx = SerializationContext("documents", MessageField.KEY)
+    value_ctx = SerializationContext("documents", MessageField.VALUE)
+
+    def encode(document: Dict[str, Any]) -> bytes:
+        value = {
+            "document_id": document["document_id"],
+            "document_text": document["document_text"],
+        }
+        key_serializer(document["document_id"], key_ctx)
+        return value_serializer(value, value_ctx)
+
+    return encode
+
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    """Generate the corpus and run every stage."""
+    from scripts.lab2_publish_docs import FlinkDocsPublisher
+
+    chunker = load_chunker()
+    corpus = make_corpus(
+        args.docs, args.doc_size, args.heading_density, args.code_ratio, args.seed
+    )
+    bodies = [chunker.parse_frontmatter(doc)[1] for doc in corpus]
+    utf8_len = lambda text: len(text.encode("utf-8"))  # noqa: E731
+
+    stages = {}
+    stages["split_on_headings"] = run_stage(
+        bodies, chunker.split_on_headings, utf8_len, len
+    )
+    stages["chunk_text"] = run_stage(
+        bodies,
+        lambda body: chunker.chunk_text(
+            body, args.chunk_size, args.overlap, args.min_chunk_size
+        ),
+        utf8_len,
+        len,
+    )
+
+    publisher = FlinkDocsPublisher({}, {"url": "http://localhost"})
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, doc in enumerate(corpus):
+            path = Path(tmp) / f"synthetic_{i}.md"
+            path.write_text(doc, encoding="utf-8")
+            paths.append(path)
+        file_bytes = {path: path.stat().st_size for path in paths}
+        # Clear memoized frontmatter so every file is actually parsed
+        stages["parse_markdown_file"] = run_stage(
+            paths,
+            publisher.parse_markdown_file,
+            file_bytes.__getitem__,
+            setup=chunker._FRONTMATTER_CACHE.clear,
+        )
+        documents = [publisher.parse_markdown_file(path) for path in paths]
+
+    stages["avro_serialize"] = run_stage(
+        documents,
+        make_avro_encoder(publisher),
+        lambda document: utf8_len(document["document_text"]),
+    )
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "docs": args.docs,
+            "doc_size_kb": args.doc_size,
+            "heading_density": args.heading_density,
+            "code_ratio": args.code_ratio,
+            "seed": args.seed,
+            "chunk_size": args.chunk_size,
+            "overlap": args.overlap,
+            "min_chunk_size": args.min_chunk_size,
+        },
+        "corpus_mb": sum(len(doc.encode("utf-8")) for doc in corpus) / (1024 * 1024),
+        "stages": stages,
+    }
+
+
+def print_results(results: Dict[str, Any], baseline: Dict[str, Any] = None) -> None:
+    """Print a per-stage summary table, with deltas against a baseline if given."""
+    print(
+        f"Corpus: {results['params']['docs']} docs, {results['corpus_mb']:.1f} MB "
+        f"(Python {results['python']})\n"
+    )
+    header = (
+        f"{'stage':<20} {'MB/s':>9} {'items/s':>10} {'out/s':>10} "
+        f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'alloc MB':>9}"
+    )
+    if baseline:
+        header += f" {'MB/s vs base':>13}"
+    print(header)
+    print("-" * len(header))
+
+    for name, stage in results["stages"].items():
+        line = (
+            f"{name:<20} {stage['mb_per_s']:>9.1f} {stage['items_per_s']:>10.0f} "
+            f"{stage['outputs_per_s']:>10.0f} {stage['p50_ms']:>8.3f} "
+            f"{stage['p99_ms']:>8.3f} {stage['max_ms']:>8.3f} "
+            f"{stage['peak_traced_mb']:>9.2f}"
+        )
+        base = baseline["stages"].get(name) if baseline else None
+        if base and base["mb_per_s"]:
+            change = (stage["mb_per_s"] / base["mb_per_s"] - 1) * 100
+            line += f" {change:>+12.1f}%"
+        print(line)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """Create and configure argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Lab2 document ingestion path"
+    )
+    parser.add_argument("--docs", type=int, default=500, help="Number of documents")
+    parser.add_argument(
+        "--doc-size", type=float, default=12, help="Average document size in KB"
+    )
+    parser.add_argument(
+        "--heading-density",
+        type=float,
+        default=1.0,
+        help="Average headings per KB of text",
+    )
+    parser.add_argument(
+        "--code-ratio",
+        type=float,
+        default=0.15,
+        help="Fraction of paragraphs that are fenced code blocks",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument("--min-chunk-size", type=int, default=1000)
+    parser.add_argument("--output", help="Save results as JSON to this file")
+    parser.add_argument(
+        "--compare", help="Earlier JSON results to compare throughput against"
+    )
+    return parser
+
+
+def main() -> None:
+    """Main entry point."""
+    args = create_argument_parser().parse_args()
+
+    results = run_suite(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("params") != results["params"]:
+            print("Warning: baseline was run with different parameters\n")
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
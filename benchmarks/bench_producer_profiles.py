@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark the docs publisher producer profiles against a local broker stand-in.
+
+Publishes the Lab2 markdown chunks (repeated to build up volume) through
+MockProducer, an in-process model of librdkafka batching, compression and
+produce round trips, once per profile in PRODUCER_PROFILES. Reports payload
+throughput, produce requests, average batch size, compression ratio and
+ack latency, so the effect of linger.ms, batch.size and compression can be
+compared without a Kafka cluster.
+
+Each compressing profile is also run with compression.type none, so the
+gain can be split into batching and compression. By default messages are
+produced as fast as possible; the link then stays saturated and batches
+fill to batch.size while earlier requests are in flight, whatever linger.ms
+is. Pace the producer with --rate to see linger.ms shape the batches.
+
+Usage:
+    python benchmarks/bench_producer_profiles.py
+    python benchmarks/bench_producer_profiles.py --repeat 20 --rtt-ms 40 --bandwidth 10
+    python benchmarks/bench_producer_profiles.py --rate 2000 --repeat 2
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.common.chunker import get_chunker_dir, load_chunker  # noqa: E402
+from scripts.common.delivery import DeliveryTracker  # noqa: E402
+from scripts.common.mock_kafka import MockProducer  # noqa: E402
+from scripts.lab2_publish_docs import PRODUCER_PROFILES, create_kafka_config  # noqa: E402
+
+
+def load_messages(docs_dir: Path) -> List[Tuple[bytes, bytes]]:
+    """Return (key, value) pairs for every markdown chunk, encoded as UTF-8."""
+    chunker = load_chunker()
+    messages = []
+    for path in chunker.find_markdown_files(str(docs_dir)):
+        frontmatter, content = chunker.read_markdown_file(path)
+        document_id = frontmatter.get("document_id", Path(path).name)
+        title = frontmatter.get("title", "")
+        text = f"# {title}\n\n{content.strip()}" if title else content.strip()
+        messages.append((str(document_id).encode("utf-8"), text.encode("utf-8")))
+    return messages
+
+
+def run_profile(
+    profile: str,
+    messages: List[Tuple[bytes, bytes]],
+    repeat: int,
+    args: argparse.Namespace,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Publish messages repeat times with one profile, plus config overrides, and collect metrics."""
+    config = {
+        **create_kafka_config("localhost:9092", "key", "secret", profile=profile),
+        **(overrides or {}),
+    }
+    producer = MockProducer(
+        config, rtt_ms=args.rtt_ms, bandwidth_mb_s=args.bandwidth, partitions=args.partitions
+    )
+    delivery = DeliveryTracker()
+
+    try:
+        start = time.perf_counter()
+        sent = 0
+        for _ in range(repeat):
+            for key, value in messages:
+                if args.rate:
+                    # Fixed schedule from the start, serving reports while waiting
+                    due = start + sent / args.rate
+                    while time.perf_counter() < due:
+                        producer.poll(due - time.perf_counter())
+                sent += 1
+                while True:
+                    try:
+                        producer.produce(
+                            "documents", value=value, key=key, on_delivery=delivery.callback()
+                        )
+                        break
+                    except BufferError:
+                        producer.poll(0.5)
+                producer.poll(0)
+        remaining = producer.flush(timeout=300)
+        elapsed = time.perf_counter() - start
+    finally:
+        producer.close()
+
+    stats = producer.stats()
+    latency = delivery.latency_ms.summary()
+    megabytes = stats["bytes_produced"] / (1024 * 1024)
+    return {
+        "messages": delivery.acked,
+        "undelivered": remaining,
+        "seconds": elapsed,
+        "mb_per_s": megabytes / elapsed if elapsed else 0.0,
+        "msgs_per_s": delivery.acked / elapsed if elapsed else 0.0,
+        "requests": stats["requests"],
+        "avg_batch_kb": (
+            stats["bytes_produced"] / stats["requests"] / 1024 if stats["requests"] else 0.0
+        ),
+        "compression_ratio": stats["compression_ratio"] or 0.0,
+        "p50_ms": latency["p50"] or 0.0,
+        "p99_ms": latency["p99"] or 0.0,
+    }
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare docs publisher producer profiles against a broker stand-in"
+    )
+    parser.add_argument(
+        "--docs-dir",
+        type=Path,
+        default=get_chunker_dir() / "markdown_chunks",
+        help="Directory of markdown chunks to publish",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Times to publish the whole directory"
+    )
+    parser.add_argument(
+        "--rtt-ms", type=float, default=20.0, help="Produce request round trip in ms"
+    )
+    parser.add_argument(
+        "--bandwidth",
+        type=float,
+        default=10.0,
+        help="Link bandwidth in MB/s (default: 10, a typical upload link)",
+    )
+    parser.add_argument("--partitions", type=int, default=6, help="Topic partitions")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0,
+        help="Produce at this many messages per second (default: 0, as fast as possible)",
+    )
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=sorted(PRODUCER_PROFILES),
+        default=list(PRODUCER_PROFILES),
+        help="Profiles to run",
+    )
+    args = parser.parse_args()
+
+    messages = load_messages(args.docs_dir)
+    corpus_mb = sum(len(value) for _, value in messages) / (1024 * 1024)
+    print(
+        f"Corpus: {len(messages)} docs, {corpus_mb:.1f} MB x {args.repeat}; "
+        f"link: {args.rtt_ms:.0f} ms RTT, {args.bandwidth:.0f} MB/s, "
+        f"{args.partitions} partitions; "
+        f"{f'{args.rate:g} msgs/s offered' if args.rate else 'unpaced'}\n"
+    )
+
+    header = (
+        f"{'profile':<24} {'MB/s':>8} {'msgs/s':>9} {'requests':>9} {'batch KB':>9} "
+        f"{'ratio':>6} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    runs = []
+    for profile in args.profiles:
+        runs.append((profile, profile, None))
+        if PRODUCER_PROFILES[profile].get("compression.type", "none") != "none":
+            runs.append((f"{profile} (uncompressed)", profile, {"compression.type": "none"}))
+
+    results = {}
+    for name, profile, overrides in runs:
+        result = results[name] = run_profile(profile, messages, args.repeat, args, overrides)
+        print(
+            f"{name:<24} {result['mb_per_s']:>8.1f} {result['msgs_per_s']:>9.0f} "
+            f"{result['requests']:>9} {result['avg_batch_kb']:>9.1f} "
+            f"{result['compression_ratio']:>6.2f} {result['p50_ms']:>8.0f} "
+            f"{result['p99_ms']:>8.0f}"
+        )
+        if result["undelivered"]:
+            print(f"  warning: {result['undelivered']} messages undelivered")
+
+    if "latency" in results and "throughput" in results and results["latency"]["mb_per_s"]:
+        speedup = results["throughput"]["mb_per_s"] / results["latency"]["mb_per_s"]
+        print(f"\nthroughput profile: {speedup:.2f}x the MB/s of the latency profile")
+        uncompressed = results.get("throughput (uncompressed)")
+        if uncompressed and uncompressed["mb_per_s"]:
+            batching = uncompressed["mb_per_s"] / results["latency"]["mb_per_s"]
+            print(
+                f"  batching (linger.ms, batch.size): {batching:.2f}x, "
+                f"compression: {speedup / batching:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Partition balance of the query publisher key strategies.
+
+Publishes a query workload through QueryPublisher and MockProducer once per
+key strategy and reports how messages spread over the partitions, how many
+distinct keys were produced and what generating a key costs. The workload
+repeats popular queries more often than rare ones (Zipf-like), as a real
+query stream does, so the effect of content keys on skew is visible.
+
+Usage:
+    python benchmarks/bench_query_keys.py
+    python benchmarks/bench_query_keys.py --messages 50000 --partitions 12
+    python benchmarks/bench_query_keys.py --replay requests.jsonl
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.common.replay import read_queries  # noqa: E402
+from scripts.lab2_publish_queries import KEY_STRATEGIES, QueryPublisher  # noqa: E402
+
+SAMPLE_QUERIES = [
+    "How do I use window functions?",
+    "What's the proper way to deduplicate a Flink table?",
+    "What are the differences between Flink SQL API and Flink Table API?",
+    "How do I join a stream with a versioned table?",
+    "What is watermarking and how does it handle late events?",
+]
+
+
+def build_workload(queries: List[str], messages: int, skew: float, seed: int) -> List[str]:
+    """Draw messages queries, query i weighted 1 / (i + 1) ** skew."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** skew for rank in range(len(queries))]
+    return rng.choices(queries, weights=weights, k=messages)
+
+
+def run_strategy(strategy: str, workload: List[str], args: argparse.Namespace) -> Dict[str, Any]:
+    """Publish the workload with one key strategy and collect partition metrics."""
+    publisher = QueryPublisher(
+        {"linger.ms": args.linger_ms},
+        {},
+        simulate={"rtt_ms": 1.0, "bandwidth_mb_s": None, "partitions": args.partitions},
+        key_strategy=strategy,
+    )
+
+    start = time.perf_counter()
+    keys = {publisher.message_key(query) for query in workload}
+    key_seconds = time.perf_counter() - start
+
+    for query in workload:
+        publisher.publish_query_async(query)
+    publisher.close()
+
+    counts = publisher.producer.stats()["partition_counts"]
+    per_partition = [counts.get(partition, 0) for partition in range(args.partitions)]
+    mean = len(workload) / args.partitions
+    return {
+        "keys": len(keys - {None}),
+        "key_us": key_seconds / len(workload) * 1e6,
+        "used": sum(1 for count in per_partition if count),
+        "max_over_mean": max(per_partition) / mean,
+        "cv": statistics.pstdev(per_partition) / mean,
+        "per_partition": per_partition,
+    }
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare partition balance of the query key strategies"
+    )
+    parser.add_argument("--messages", type=int, default=20000, help="Queries to publish")
+    parser.add_argument("--partitions", type=int, default=6, help="Topic partitions")
+    parser.add_argument(
+        "--distinct", type=int, default=500, help="Distinct queries in the workload"
+    )
+    parser.add_argument(
+        "--skew", type=float, default=1.0, help="Zipf exponent of query popularity (0 = uniform)"
+    )
+    parser.add_argument(
+        "--linger-ms", type=float, default=5.0, help="Producer linger.ms (sticky batches for null keys)"
+    )
+    parser.add_argument(
+        "--replay", type=Path, help="Draw queries from this file instead of generated ones"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Workload random seed")
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=KEY_STRATEGIES,
+        default=list(KEY_STRATEGIES),
+        help="Strategies to run",
+    )
+    args = parser.parse_args()
+
+    if args.replay:
+        queries = list(read_queries(args.replay))
+    else:
+        queries = [
+            f"{SAMPLE_QUERIES[index % len(SAMPLE_QUERIES)]} (variant {index})"
+            for index in range(args.distinct)
+        ]
+    workload = build_workload(queries, args.messages, args.skew, args.seed)
+    print(
+        f"{args.messages} queries ({len(set(workload))} distinct, skew {args.skew:g}) "
+        f"over {args.partitions} partitions\n"
+    )
+
+    header = (
+        f"{'strategy':<10} {'keys':>7} {'key us':>7} {'used':>5} {'max/mean':>9} "
+        f"{'cv':>6}  messages per partition"
+    )
+    print(header)
+    print("-" * len(header))
+    for strategy in args.strategies:
+        result = run_strategy(strategy, workload, args)
+        print(
+            f"{strategy:<10} {result['keys']:>7} {result['key_us']:>7.2f} {result['used']:>5} "
+            f"{result['max_over_mean']:>9.2f} {result['cv']:>6.2f}  "
+            f"{' '.join(str(count) for count in result['per_partition'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Per-message serialization cost: legacy AvroProducer path vs SerializingProducer path.
+
+Encodes the key and value of every Lab2 markdown chunk (or a list of short
+queries) the way each producer does before handing bytes to librdkafka:
+
+- legacy: confluent_kafka.avro MessageSerializer.encode_record_with_schema,
+  as called by AvroProducer.produce (validates each record against the
+  schema, then encodes it)
+- avro_serializer: confluent_kafka.schema_registry.avro.AvroSerializer
+- cached: CachedAvroSerializer used by the publishers, with its schema ID
+  registered once up front
+
+All paths use an in-process Schema Registry stand-in, so only local
+serialization is measured. Outputs are checked to carry identical Avro
+bodies before timing.
+
+Usage:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --payload queries --repeat 20
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from confluent_kafka.serialization import MessageField, SerializationContext  # noqa: E402
+
+from scripts.common.chunker import get_chunker_dir  # noqa: E402
+from scripts.common.mock_kafka import MockSchemaRegistryClient  # noqa: E402
+from scripts.common.serialization import CachedAvroSerializer  # noqa: E402
+from scripts.lab2_publish_docs import FlinkDocsPublisher  # noqa: E402
+from scripts.lab2_publish_queries import QueryPublisher  # noqa: E402
+
+Encoder = Callable[[Any, Dict[str, Any]], Tuple[bytes, bytes]]
+
+SAMPLE_QUERIES = [
+    "How do I use window functions?",
+    "What's the proper way to deduplicate a Flink table?",
+    "What are the differences between Flink SQL API and Flink Table API?",
+    "How do I join a stream with a versioned table?",
+    "What is watermarking and how does it handle late events?",
+]
+
+
+def load_messages(payload: str) -> Tuple[Any, List[Tuple[str, Dict[str, Any]]]]:
+    """Return the publisher owning the schemas and (key, value) pairs to encode."""
+    if payload == "queries":
+        publisher = QueryPublisher({}, {"url": "http://localhost"})
+        return publisher, [(query, {"query": query}) for query in SAMPLE_QUERIES]
+
+    publisher = FlinkDocsPublisher({}, {"url": "http://localhost"})
+    messages = []
+    for path in sorted((get_chunker_dir() / "markdown_chunks").glob("*.md")):
+        document = publisher.parse_markdown_file(path)
+        if document:
+            value = {
+                "document_id": document["document_id"],
+                "document_text": document["document_text"],
+            }
+            messages.append((document["document_id"], value))
+    return publisher, messages
+
+
+def make_legacy_encoder(publisher: Any, topic: str) -> Optional[Encoder]:
+    """Encode as AvroProducer.produce does; None if the legacy avro package is missing."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            from confluent_kafka import avro
+            from confluent_kafka.avro.serializer.message_serializer import (
+                MessageSerializer,
+            )
+    except ImportError:
+        return None
+
+    serializer = MessageSerializer(MockSchemaRegistryClient())
+    key_schema = avro.loads(publisher.key_schema)
+    value_schema = avro.loads(publisher.value_schema)
+
+    def encode(key: Any, value: Dict[str, Any]) -> Tuple[bytes, bytes]:
+        return (
+            serializer.encode_record_with_schema(topic, key_schema, key, is_key=True),
+            serializer.encode_record_with_schema(topic, value_schema, value),
+        )
+
+    return encode
+
+
+def make_avro_serializer_encoder(publisher: Any, topic: str) -> Optional[Encoder]:
+    """
+    Encode with the stock schema_registry AvroSerializer.
+
+    Needs the built-in mock:// Schema Registry client (confluent-kafka 2.8+);
+    returns None on older versions.
+    """
+    from confluent_kafka.schema_registry import SchemaRegistryClient
+    from confluent_kafka.schema_registry.avro import AvroSerializer
+
+    if not hasattr(SchemaRegistryClient, "new_client"):
+        return None
+    registry = SchemaRegistryClient.new_client({"url": "mock://bench"})
+    key_serializer = AvroSerializer(registry, publisher.key_schema)
+    value_serializer = AvroSerializer(registry, publisher.value_schema)
+    key_ctx = SerializationContext(topic, MessageField.KEY)
+    value_ctx = SerializationContext(topic, MessageField.VALUE)
+
+    def encode(key: Any, value: Dict[str, Any]) -> Tuple[bytes, bytes]:
+        return key_serializer(key, key_ctx), value_serializer(value, value_ctx)
+
+    return encode
+
+
+def make_cached_encoder(publisher: Any, topic: str) -> Encoder:
+    """Encode with the publishers' CachedAvroSerializer."""
+    registry = MockSchemaRegistryClient()
+    key_serializer = CachedAvroSerializer(registry, publisher.key_schema)
+    value_serializer = CachedAvroSerializer(registry, publisher.value_schema)
+    key_serializer.register(f"{topic}-key")
+    value_serializer.register(f"{topic}-value")
+    key_ctx = SerializationContext(topic, MessageField.KEY)
+    value_ctx = SerializationContext(topic, MessageField.VALUE)
+
+    def encode(key: Any, value: Dict[str, Any]) -> Tuple[bytes, bytes]:
+        return key_serializer(key, key_ctx), value_serializer(value, value_ctx)
+
+    return encode
+
+
+def time_encoder(
+    encode: Encoder, messages: List[Tuple[str, Dict[str, Any]]], repeat: int
+) -> Tuple[float, int]:
+    """Return (best seconds per pass, encoded bytes per pass) over repeat passes."""
+    best = float("inf")
+    encoded = 0
+    for _ in range(repeat):
+        encoded = 0
+        start = time.perf_counter()
+        for key, value in messages:
+            key_bytes, value_bytes = encode(key, value)
+            encoded += len(key_bytes) + len(value_bytes)
+        best = min(best, time.perf_counter() - start)
+    return best, encoded
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare per-message Avro serialization cost of the producer paths"
+    )
+    parser.add_argument(
+        "--payload",
+        choices=["docs", "queries"],
+        default="docs",
+        help="Encode Lab2 document chunks or short queries (default: docs)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Passes per path")
+    parser.add_argument(
+        "--min-messages",
+        type=int,
+        default=5000,
+        help="Repeat the payload list until it has at least this many messages",
+    )
+    args = parser.parse_args()
+
+    topic = args.payload if args.payload == "queries" else "documents"
+    publisher, messages = load_messages(args.payload)
+    if not messages:
+        sys.exit("No messages to encode")
+    messages = messages * max(1, -(-args.min_messages // len(messages)))
+
+    encoders = {
+        "legacy": make_legacy_encoder(publisher, topic),
+        "avro_serializer": make_avro_serializer_encoder(publisher, topic),
+        "cached": make_cached_encoder(publisher, topic),
+    }
+    encoders = {name: encode for name, encode in encoders.items() if encode}
+    if "legacy" not in encoders:
+        print("Legacy confluent_kafka.avro path unavailable (avro package missing)\n")
+
+    # Every path must produce the same Avro body (schema IDs may differ)
+    for key, value in messages[:50]:
+        bodies = {
+            tuple(encoded[5:] for encoded in encode(key, value))
+            for encode in encoders.values()
+        }
+        if len(bodies) != 1:
+            sys.exit(f"Serialization paths disagree for key {key!r}")
+
+    print(f"{len(messages)} {args.payload} messages per pass, best of {args.repeat}\n")
+    header = f"{'path':<16} {'us/msg':>8} {'msgs/s':>10} {'MB/s':>8} {'vs legacy':>10}"
+    print(header)
+    print("-" * len(header))
+
+    legacy_per_msg = None
+    for name, encode in encoders.items():
+        seconds, encoded = time_encoder(encode, messages, args.repeat)
+        per_msg = seconds / len(messages) * 1e6
+        if name == "legacy":
+            legacy_per_msg = per_msg
+        line = (
+            f"{name:<16} {per_msg:>8.2f} {len(messages) / seconds:>10.0f} "
+            f"{encoded / seconds / (1024 * 1024):>8.1f}"
+        )
+        if legacy_per_msg:
+            line += f" {legacy_per_msg / per_msg:>9.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Publish checkpoints for resumable document publishing.
+
+A checkpoint records every document the broker has acknowledged together
+with a hash of the content that was delivered. A rerun skips documents
+whose current content hash matches the checkpoint, so an interrupted or
+repeated publish only sends what is missing or changed.
+
+Comparing the checkpoint with the current documents also shows which
+documents are new, changed or were deleted since they were published.
+Each entry records the scope (source and file selection) it was last
+published from, so deletions are only inferred for documents of the same
+scope, or of a scope the current one covers: a run over a subset of the
+docs does not delete the rest, but a full run does delete documents an
+earlier subset run published.
+
+The file is an append-only JSON lines log: a header line naming the target
+(cluster and topic) and the scopes entries refer to, followed by one line
+per acknowledged document or tombstone. Acks are appended as delivery reports arrive, so a crash loses
+at most the last unflushed writes, and a torn final line is ignored on
+load. Closing the checkpoint compacts the log to one line per document.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+CHECKPOINT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+def scope_key(scope: Dict[str, Any]) -> str:
+    """
+    Return a short stable key for a publish scope, e.g. source directory and globs.
+
+    Lists in the scope should be normalized (sorted, deduplicated) by the
+    caller, so the same selection always gets the same key.
+    """
+    encoded = json.dumps(scope, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def content_hash(document: Dict[str, Any]) -> str:
+    """Return a stable hash of the fields a document is published with."""
+    digest = hashlib.sha256()
+    digest.update(str(document["document_id"]).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(document["document_text"].encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PublishCheckpoint:
+    """Delivered document_ids and content hashes for one publish target."""
+
+    def __init__(
+        self,
+        path: Path,
+        target: Dict[str, Any],
+        flush_every: int = 100,
+        scope: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Open a checkpoint, loading earlier entries recorded for the same target.
+
+        Entries written for a different target (another cluster or topic)
+        are discarded, since nothing was delivered there.
+
+        Args:
+            path: Checkpoint file
+            target: Identifies where documents are delivered, e.g. cluster and topic
+            flush_every: Flush appended acks to disk after this many
+            scope: Source being published (see scope_key), recorded with each ack
+        """
+        self.path = Path(path)
+        self.target = target
+        self.flush_every = flush_every
+        self.scope_info = scope
+        self.scope = scope_key(scope) if scope is not None else None
+        # document_id -> scope key it was last delivered from
+        self.scopes: Dict[str, Optional[str]] = {}
+        # scope key -> scope, for every scope entries refer to
+        self.known_scopes: Dict[str, Dict[str, Any]] = {}
+        self.documents: Dict[str, str] = self._load()
+        if scope is not None:
+            self.known_scopes[self.scope] = scope
+        self._unflushed = 0
+
+        # Rewrite compacted so new acks append to a log for this target
+        self._file = None
+        self._rewrite()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return {}
+
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except json.JSONDecodeError:
+            header = {}
+        if header.get("version") != CHECKPOINT_VERSION or header.get("target") != self.target:
+            if lines:
+                logger.warning(
+                    f"Checkpoint {self.path} was written for a different target; starting fresh"
+                )
+            return {}
+        if isinstance(header.get("scopes"), dict):
+            self.known_scopes = dict(header["scopes"])
+
+        documents = {}
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn write from an interrupted run
+                continue
+            if not isinstance(entry, dict) or "id" not in entry:
+                continue
+            if entry.get("deleted"):
+                documents.pop(entry["id"], None)
+                self.scopes.pop(entry["id"], None)
+            elif "hash" in entry:
+                documents[entry["id"]] = entry["hash"]
+                self.scopes[entry["id"]] = entry.get("scope")
+        return documents
+
+    def _rewrite(self) -> None:
+        """Atomically write the header and all entries, then reopen for appending."""
+        if self._file is not None:
+            self._file.close()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        used = set(self.scopes.values()) | {self.scope}
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "target": self.target,
+            "scopes": {key: scope for key, scope in self.known_scopes.items() if key in used},
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for document_id, digest in self.documents.items():
+                f.write(json.dumps(self._entry(document_id, digest, self.scopes.get(document_id))) + "\n")
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _entry(document_id: str, digest: str, scope: Optional[str]) -> Dict[str, Any]:
+        entry = {"id": document_id, "hash": digest}
+        if scope is not None:
+            entry["scope"] = scope
+        return entry
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def status(self, document_id: str, digest: str) -> str:
+        """
+        Compare a document with what was delivered.
+
+        Returns:
+            "new" if never delivered, "unchanged" if delivered with this
+            content hash, "changed" otherwise
+        """
+        delivered = self.documents.get(document_id)
+        if delivered is None:
+            return "new"
+        return "unchanged" if delivered == digest else "changed"
+
+    def missing(
+        self,
+        document_ids: Set[str],
+        covers: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> List[str]:
+        """
+        Return document_ids last delivered from this scope but not among document_ids.
+
+        These are documents deleted from the source. Documents delivered from
+        another scope (a different source, or other include/exclude globs)
+        are only reported if covers says this run's selection includes
+        everything that scope selected, since otherwise this run could not
+        have seen them.
+
+        Args:
+            document_ids: Documents present in this run
+            covers: Called with an earlier scope; True if this run's scope covers it
+        """
+        covered = {self.scope}
+        if covers is not None:
+            covered.update(key for key, scope in self.known_scopes.items() if covers(scope))
+        return [
+            document_id
+            for document_id in self.documents
+            if document_id not in document_ids and self.scopes.get(document_id) in covered
+        ]
+
+    def claim(self, document_id: str) -> None:
+        """Move an already delivered, unchanged document into this run's scope."""
+        if self.scopes.get(document_id) != self.scope and document_id in self.documents:
+            self.record(document_id, self.documents[document_id])
+
+    def record(self, document_id: str, digest: Optional[str]) -> None:
+        """
+        Record an acknowledged document, or its deletion when digest is None.
+
+        Acks arriving after close(), e.g. served by a final producer flush
+        once the publish timed out, are not recorded; the document is then
+        simply published again on the next run.
+        """
+        if self._file is None:
+            logger.debug(f"Checkpoint closed, not recording late ack for {document_id}")
+            return
+        if digest is None:
+            self.documents.pop(document_id, None)
+            self.scopes.pop(document_id, None)
+            entry = {"id": document_id, "deleted": True}
+        else:
+            self.documents[document_id] = digest
+            self.scopes[document_id] = self.scope
+            entry = self._entry(document_id, digest, self.scope)
+        self._file.write(json.dumps(entry) + "\n")
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def callback(
+        self, document_id: str, digest: Optional[str], on_delivery: Callable[[Any, Any], None]
+    ) -> Callable[[Any, Any], None]:
+        """
+        Wrap a delivery callback so an acknowledged document is recorded.
+
+        Args:
+            document_id: Document being produced
+            digest: Its content hash, or None for a tombstone
+            on_delivery: Delivery callback to chain to
+
+        Returns:
+            Delivery callback for produce()
+        """
+
+        def _on_delivery(err: Any, msg: Any) -> None:
+            on_delivery(err, msg)
+            if err is None:
+                self.record(document_id, digest)
+
+        return _on_delivery
+
+    def flush(self) -> None:
+        """Write appended acks through to disk."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unflushed = 0
+
+    def close(self) -> None:
+        """Compact the log and close it."""
+        if self._file is None:
+            return
+        self._rewrite()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> "PublishCheckpoint":
+        return self
+
+    def __exit__(self, *exc: Optional[Any]) -> None:
+        self.close()
@@ -0,0 +1,35 @@
+"""
+Access to the Lab2 document chunker from the publisher tools.
+
+assets/lab2/flink_docs/chunk_documents.py is a standalone script rather than
+part of this package. This module imports it from its directory so the
+publishers share its frontmatter parsing and chunking code instead of
+keeping their own copies.
+"""
+
+import importlib
+import sys
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+
+from .terraform import get_project_root
+
+
+def get_chunker_dir() -> Path:
+    """Return the directory containing chunk_documents.py."""
+    return get_project_root() / "assets/lab2/flink_docs"
+
+
+@lru_cache(maxsize=None)
+def load_chunker() -> ModuleType:
+    """
+    Import the chunk_documents module.
+
+    Returns:
+        The chunk_documents module
+    """
+    chunker_dir = str(get_chunker_dir())
+    if chunker_dir not in sys.path:
+        sys.path.insert(0, chunker_dir)
+    return importlib.import_module("chunk_documents")
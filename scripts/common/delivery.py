@@ -0,0 +1,64 @@
+"""
+Kafka delivery report tracking for the publisher tools.
+
+Counts messages actually acknowledged by the broker (rather than merely
+enqueued by produce()) and records the enqueue-to-ack latency of each.
+"""
+
+import logging
+import time
+from functools import partial
+from typing import Any, Callable, Dict
+
+from confluent_kafka import KafkaError
+
+from .metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryTracker:
+    """Aggregate per-message delivery reports into acked/failed/timed-out counts."""
+
+    def __init__(self):
+        self.enqueued = 0
+        self.acked = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.latency_ms = Histogram()
+
+    def callback(self) -> Callable[[Any, Any], None]:
+        """
+        Create the on_delivery callback for one message.
+
+        Call this right before produce() so the enqueue time is captured.
+        """
+        self.enqueued += 1
+        return partial(self._on_delivery, time.perf_counter())
+
+    def _on_delivery(self, enqueued_at: float, err: Any, msg: Any) -> None:
+        if err is None:
+            self.acked += 1
+            self.latency_ms.observe((time.perf_counter() - enqueued_at) * 1000)
+        elif err.code() == KafkaError._MSG_TIMED_OUT:
+            self.timed_out += 1
+            logger.error(f"Delivery timed out for key {msg.key()!r}")
+        else:
+            self.failed += 1
+            logger.error(f"Delivery failed for key {msg.key()!r}: {err}")
+
+    @property
+    def pending(self) -> int:
+        """Messages enqueued without a delivery report yet."""
+        return self.enqueued - self.acked - self.failed - self.timed_out
+
+    def summary(self) -> Dict[str, Any]:
+        """Return delivery counts and ack latency statistics."""
+        return {
+            "enqueued": self.enqueued,
+            "acked": self.acked,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "pending": self.pending,
+            "ack_latency_ms": self.latency_ms.summary(),
+        }
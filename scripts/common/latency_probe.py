@@ -0,0 +1,249 @@
+"""
+End-to-end latency probe for the Lab2 RAG pipeline.
+
+The pipeline carries only the query text from topic to topic:
+
+    queries -> queries_embed -> search_results -> search_results_response
+
+so each probe query gets a correlation tag appended to its text, e.g.
+"What is watermarking? [probe:3f9c2a1b-7]". The tag is found directly in
+the raw message value of every downstream topic, without decoding it,
+which works whatever Avro schema Flink registered for the table.
+
+LatencyProbe records when each tagged query was sent, acknowledged and
+first seen on each downstream topic, and summarizes end-to-end and
+per-hop latency. SimulatedRagPipeline forwards messages between the
+topics of a MockLog with model-like delays, so the probe can be exercised
+without a cluster.
+"""
+
+import heapq
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .mock_kafka import MockConsumer, MockLog
+
+# Downstream topics in pipeline order
+PIPELINE_TOPICS = ("queries_embed", "search_results", "search_results_response")
+
+# Mean simulated processing time per hop in ms: embedding, vector search, LLM response
+SIMULATED_DELAYS_MS = {
+    "queries_embed": 300.0,
+    "search_results": 150.0,
+    "search_results_response": 2000.0,
+}
+
+_TAG = re.compile(rb"\[probe:([0-9a-f]{8}-\d+)\]")
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, Optional[float]]:
+    """
+    Summarize latency samples with exact nearest-rank percentiles.
+
+    Probes are small (tens to hundreds of queries) and every sample is
+    kept, so there is no need for the bucketed metrics.Histogram, whose
+    bucket upper bounds would be far too coarse at multi-second latencies.
+    """
+    if not samples:
+        return {"count": 0, "mean": None, "min": None, "max": None,
+                "p50": None, "p90": None, "p99": None}
+    ordered = sorted(samples)
+
+    def percentile(pct: float) -> float:
+        return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "p50": percentile(50),
+        "p90": percentile(90),
+        "p99": percentile(99),
+    }
+
+
+class LatencyProbe:
+    """Tags probe queries and times them through the pipeline topics."""
+
+    def __init__(self, topics: Tuple[str, ...] = PIPELINE_TOPICS):
+        """
+        Initialize the probe with a fresh run ID.
+
+        Args:
+            topics: Downstream topics in pipeline order; the last is the response
+        """
+        self.run_id = uuid.uuid4().hex[:8]
+        self.topics = topics
+        self.sent: Dict[str, float] = {}
+        self.acked: Dict[str, float] = {}
+        self.seen: Dict[str, Dict[str, float]] = {topic: {} for topic in topics}
+
+    def tag(self, query: str, index: int) -> Tuple[str, str]:
+        """Return (tag ID, query text carrying the tag) for probe query number index."""
+        tag_id = f"{self.run_id}-{index}"
+        return tag_id, f"{query} [probe:{tag_id}]"
+
+    def record_sent(self, tag_id: str) -> None:
+        self.sent[tag_id] = time.monotonic()
+
+    def record_acked(self, tag_id: str) -> None:
+        self.acked[tag_id] = time.monotonic()
+
+    def record_message(self, topic: str, value: Optional[bytes]) -> Optional[str]:
+        """
+        Record the first arrival of a probe query on topic.
+
+        Returns:
+            The tag ID if value carries a tag from this run, else None
+        """
+        match = _TAG.search(value or b"")
+        if match is None or topic not in self.seen:
+            return None
+        tag_id = match.group(1).decode("ascii")
+        if tag_id not in self.sent:
+            # Left over from another probe run
+            return None
+        self.seen[topic].setdefault(tag_id, time.monotonic())
+        return tag_id
+
+    @property
+    def completed(self) -> int:
+        """Probe queries that reached the last topic."""
+        return len(self.seen[self.topics[-1]])
+
+    def hops(self) -> List[Tuple[str, str, str]]:
+        """Return (hop name, from stamp, to stamp) pairs, e.g. queries -> queries_embed."""
+        stages = ["sent", "acked"] + list(self.topics)
+        names = ["publish ack", f"queries -> {self.topics[0]}"] + [
+            f"{source} -> {target}" for source, target in zip(self.topics, self.topics[1:])
+        ]
+        return list(zip(names, stages, stages[1:]))
+
+    def _stamps(self, stage: str) -> Dict[str, float]:
+        if stage == "sent":
+            return self.sent
+        if stage == "acked":
+            return self.acked
+        return self.seen[stage]
+
+    def summary(self) -> Dict[str, Any]:
+        """Return end-to-end and per-hop latency summaries in ms, plus counts."""
+        sent = self.sent
+        end_to_end = [
+            (received - sent[tag_id]) * 1000
+            for tag_id, received in self._stamps(self.topics[-1]).items()
+        ]
+
+        hops = {}
+        for name, source, target in self.hops():
+            source_stamps = self._stamps(source)
+            hops[name] = _latency_summary(
+                [
+                    max(0.0, arrived - source_stamps[tag_id]) * 1000
+                    for tag_id, arrived in self._stamps(target).items()
+                    if tag_id in source_stamps
+                ]
+            )
+
+        return {
+            "sent": len(self.sent),
+            "completed": self.completed,
+            "reached": {topic: len(self.seen[topic]) for topic in self.topics},
+            "end_to_end_ms": _latency_summary(end_to_end),
+            "hops_ms": hops,
+        }
+
+    def format_report(self) -> str:
+        """Format the summary as a plain-text table."""
+        summary = self.summary()
+        lines = [f"Probe {self.run_id}: {summary['completed']}/{summary['sent']} queries answered"]
+        for topic, count in summary["reached"].items():
+            lines.append(f"  reached {topic}: {count}")
+        header = f"{'hop':<42} {'count':>6} {'mean ms':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}"
+        lines.extend(["", header, "-" * len(header)])
+        rows = list(summary["hops_ms"].items()) + [("end to end", summary["end_to_end_ms"])]
+        for name, stats in rows:
+            if not stats["count"]:
+                lines.append(f"{name:<42} {0:>6}")
+                continue
+            lines.append(
+                f"{name:<42} {stats['count']:>6} {stats['mean']:>9.0f} {stats['p50']:>8.0f} "
+                f"{stats['p90']:>8.0f} {stats['p99']:>8.0f}"
+            )
+        return "\n".join(lines)
+
+
+class SimulatedRagPipeline:
+    """
+    Stand-in for the Flink statements, forwarding message values from topic to topic of a MockLog.
+
+    Each hop waits a random 50-150% of its mean delay per message, like
+    the embedding, vector search and LLM calls of the real pipeline.
+    """
+
+    def __init__(
+        self,
+        log: "MockLog",
+        source: str = "queries",
+        topics: Tuple[str, ...] = PIPELINE_TOPICS,
+        delays_ms: Optional[Dict[str, float]] = None,
+    ):
+        self.log = log
+        delays_ms = delays_ms or SIMULATED_DELAYS_MS
+        self.hops = [
+            (hop_source, target, delays_ms.get(target, 0.0) / 1000)
+            for hop_source, target in zip((source,) + topics, topics)
+        ]
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Start one forwarding thread per hop, reading from the current end of its source."""
+        from .mock_kafka import MockConsumer
+
+        for source, target, delay in self.hops:
+            consumer = MockConsumer({"auto.offset.reset": "latest"}, self.log)
+            consumer.subscribe([source])
+            thread = threading.Thread(
+                target=self._forward,
+                args=(consumer, target, delay),
+                name=f"mock-{target}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _forward(self, consumer: "MockConsumer", target: str, delay: float) -> None:
+        from .mock_kafka import MockProducer
+
+        producer = MockProducer({"linger.ms": 0}, rtt_ms=0, bandwidth_mb_s=None, log=self.log)
+        pending: List[Tuple[float, int, Any]] = []
+        sequence = 0
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                wait = min(0.1, pending[0][0] - now) if pending else 0.1
+                message = consumer.poll(max(0.0, wait))
+                if message is not None:
+                    sequence += 1
+                    due = time.monotonic() + delay * random.uniform(0.5, 1.5)
+                    heapq.heappush(pending, (due, sequence, message))
+                while pending and pending[0][0] <= time.monotonic():
+                    _, _, message = heapq.heappop(pending)
+                    producer.produce(target, value=message.value(), key=message.key())
+                producer.poll(0)
+        finally:
+            producer.close()
+            consumer.close()
@@ -0,0 +1,288 @@
+"""
+Lightweight metrics primitives for the publisher tools.
+
+Provides a fixed-bucket histogram for latencies that is cheap enough to
+update from Kafka delivery callbacks on every message, and Metrics, which
+groups counters, per-stage timings and librdkafka statistics for a
+publisher and prints them as a table or exports them as Prometheus text or
+JSON.
+"""
+
+import bisect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Bucket upper bounds in milliseconds, roughly 1-2-5 spaced
+DEFAULT_BUCKETS_MS = (
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000,
+)
+
+# Per-stage timings (parsing, encoding, enqueueing) take microseconds
+STAGE_BUCKETS_MS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5) + DEFAULT_BUCKETS_MS
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min, max and percentile estimates."""
+
+    def __init__(self, buckets: Optional[List[float]] = None):
+        """
+        Initialize the histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds; an overflow bucket is added
+        """
+        self.buckets = list(buckets or DEFAULT_BUCKETS_MS)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float) -> None:
+        """Record a single value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Estimate a percentile as the upper bound of the bucket containing it.
+
+        Values in the overflow bucket report the observed maximum.
+        """
+        if not self.count:
+            return None
+        rank = pct / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.max
+                return min(self.buckets[index], self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Return count, mean, min, max and p50/p90/p99 estimates."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+def _format_number(value: float) -> str:
+    """Format integral values without a decimal point or exponent."""
+    return str(int(value)) if float(value).is_integer() else f"{value:.6g}"
+
+
+class Metrics:
+    """
+    Counters, per-stage timing histograms and librdkafka statistics for one publisher.
+
+    Stage timings are kept in milliseconds and may be observed from several
+    threads (e.g. file parsing workers). on_stats can be passed to the
+    producer as its stats_cb.
+    """
+
+    def __init__(self, namespace: str):
+        """
+        Initialize empty metrics.
+
+        Args:
+            namespace: Prefix of exported metric names, e.g. "publish_docs"
+        """
+        self.namespace = namespace
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.librdkafka: Dict[str, float] = {}
+        self.librdkafka_stats: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add value to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def histogram(self, stage: str, buckets: Optional[List[float]] = None) -> Histogram:
+        """Return the timing histogram of a stage, creating it on first use."""
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(
+                    stage, Histogram(buckets or STAGE_BUCKETS_MS)
+                )
+        return histogram
+
+    def observe(self, stage: str, elapsed_ms: float) -> None:
+        """Record the duration of one pass through a stage."""
+        histogram = self.histogram(stage)
+        with self._lock:
+            histogram.observe(elapsed_ms)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as one pass through stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, (time.perf_counter() - start) * 1000)
+
+    def timed(self, stage: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap func so every call is timed as one pass through stage."""
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(stage, (time.perf_counter() - start) * 1000)
+
+        return wrapper
+
+    def on_stats(self, stats_json: str) -> None:
+        """
+        stats_cb for the producer: keep the latest librdkafka statistics.
+
+        Besides the raw statistics, the gauges most useful for finding a
+        bottleneck are extracted: local queue depth, request and retry
+        counts, and broker round trip, internal queue and output buffer
+        latencies (the worst broker's, in ms), and average batch size.
+        """
+        stats = json.loads(stats_json)
+        gauges = {
+            "queue_messages": stats.get("msg_cnt", 0),
+            "queue_bytes": stats.get("msg_size", 0),
+            "tx_messages": stats.get("txmsgs", 0),
+            "tx_message_bytes": stats.get("txmsg_bytes", 0),
+            "tx_requests": stats.get("tx", 0),
+            "tx_retries": stats.get("txretries", 0),
+        }
+
+        brokers = [
+            broker for broker in stats.get("brokers", {}).values()
+            if broker.get("nodeid", -1) >= 0
+        ]
+        for window in ("rtt", "int_latency", "outbuf_latency", "throttle"):
+            sampled = [broker[window] for broker in brokers if broker.get(window, {}).get("cnt")]
+            if sampled:
+                # librdkafka reports window statistics in microseconds
+                gauges[f"{window}_avg_ms"] = max(w["avg"] for w in sampled) / 1000
+                gauges[f"{window}_p99_ms"] = max(w["p99"] for w in sampled) / 1000
+        gauges["requests_in_flight"] = sum(broker.get("waitresp_cnt", 0) for broker in brokers)
+
+        for window, name in (("batchsize", "batch_bytes_avg"), ("batchcnt", "batch_messages_avg")):
+            sampled = [
+                topic[window]["avg"]
+                for topic in stats.get("topics", {}).values()
+                if topic.get(window, {}).get("cnt")
+            ]
+            if sampled:
+                gauges[name] = max(sampled)
+
+        with self._lock:
+            self.librdkafka = gauges
+            self.librdkafka_stats = stats
+
+    def summary(self) -> Dict[str, Any]:
+        """Return counters, stage summaries and librdkafka gauges."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "stages_ms": {
+                    stage: histogram.summary() for stage, histogram in self.histograms.items()
+                },
+                "librdkafka": dict(self.librdkafka),
+            }
+
+    def format_table(self) -> str:
+        """Format the summary as a plain-text table."""
+        summary = self.summary()
+        header = (
+            f"{'stage':<20} {'count':>8} {'total ms':>10} {'mean ms':>9} "
+            f"{'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for stage, stats in summary["stages_ms"].items():
+            if not stats["count"]:
+                continue
+            lines.append(
+                f"{stage:<20} {stats['count']:>8} {stats['mean'] * stats['count']:>10.1f} "
+                f"{stats['mean']:>9.3f} {stats['p50']:>9.3f} {stats['p99']:>9.3f} "
+                f"{stats['max']:>9.3f}"
+            )
+        for title, values in (("counter", summary["counters"]), ("librdkafka", summary["librdkafka"])):
+            if values:
+                lines.append("")
+                lines.extend(f"{title + ' ' + name:<40} {_format_number(value):>12}" for name, value in values.items())
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        """Export the summary, plus the latest raw librdkafka statistics, as JSON."""
+        summary = self.summary()
+        summary["librdkafka_stats"] = self.librdkafka_stats
+        return json.dumps(summary, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Export counters, stage histograms and librdkafka gauges in Prometheus text format."""
+        prefix = self.namespace
+        lines = []
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = dict(self.histograms)
+            gauges = dict(self.librdkafka)
+
+            for name, value in counters.items():
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {_format_number(value)}")
+
+            if histograms:
+                metric = f"{prefix}_stage_duration_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for stage, histogram in histograms.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f'{metric}_bucket{{stage="{stage}",le="{bound / 1000:g}"}} {cumulative}'
+                        )
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram.total / 1000:g}')
+                    lines.append(f'{metric}_count{{stage="{stage}"}} {histogram.count}')
+
+        for name, value in gauges.items():
+            lines.append(f"# TYPE {prefix}_librdkafka_{name} gauge")
+            lines.append(f"{prefix}_librdkafka_{name} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: Path) -> None:
+        """Write the metrics to path: JSON for a .json file, Prometheus text otherwise."""
+        text = self.to_json() if Path(path).suffix == ".json" else self.to_prometheus()
+        Path(path).write_text(text, encoding="utf-8")
+
+
+def report(metrics: Metrics, show_table: bool = False, path: Optional[Path] = None) -> None:
+    """Print the metrics table and/or export the metrics to path, as requested."""
+    if show_table:
+        print(metrics.format_table())
+    if path is not None:
+        metrics.export(path)
+        logging.getLogger(__name__).info(f"Metrics written to {path}")
@@ -0,0 +1,491 @@
+"""
+In-process Kafka broker and Schema Registry stand-ins for benchmarks and offline runs.
+
+MockProducer implements the part of the confluent_kafka.Producer interface
+the publisher tools use (produce, poll, flush, list_topics, len), applies key.serializer
+and value.serializer from the configuration like SerializingProducer, and
+models how librdkafka batches and ships messages:
+
+- Messages accumulate per partition until a batch reaches batch.size,
+  batch.num.messages or message.max.bytes, or has waited linger.ms.
+- Each batch is compressed with compression.type and sent as one produce
+  request; at most max.in.flight.requests.per.connection are outstanding.
+- A request occupies the simulated link for its compressed size divided by
+  the bandwidth, then is acknowledged one round trip later.
+
+Like the real producer it needs no close(): the simulated broker thread
+only runs while messages are queued or in flight, so a flushed producer
+leaves nothing behind.
+
+Given a MockLog, delivered messages are also stored so MockConsumer can
+read them back, e.g. to stand in for a pipeline of topics end to end.
+
+Only zlib is in the standard library, so it stands in for the other codecs
+at a comparable level (lz4/snappy fastest, zstd middle, gzip default).
+Compression ratios and CPU cost are therefore approximate.
+"""
+
+import heapq
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from confluent_kafka import TopicPartition
+from confluent_kafka.admin import ClusterMetadata, PartitionMetadata, TopicMetadata
+from confluent_kafka.serialization import MessageField, SerializationContext
+
+# zlib level standing in for each compression.type (None = uncompressed)
+COMPRESSION_LEVELS = {
+    "none": None,
+    "lz4": 1,
+    "snappy": 1,
+    "zstd": 3,
+    "gzip": 6,
+}
+
+# Approximate Kafka record batch framing, in bytes
+BATCH_OVERHEAD = 61
+RECORD_OVERHEAD = 20
+
+
+class MockMessage:
+    """Delivered message, with the accessors delivery callbacks use."""
+
+    __slots__ = ("_topic", "_partition", "_key", "_value", "_offset")
+
+    def __init__(self, topic: str, partition: int, key: Optional[bytes], value: Optional[bytes]):
+        self._topic = topic
+        self._partition = partition
+        self._key = key
+        self._value = value
+        self._offset = -1
+
+    def topic(self) -> str:
+        return self._topic
+
+    def partition(self) -> int:
+        return self._partition
+
+    def key(self) -> Optional[bytes]:
+        return self._key
+
+    def value(self) -> Optional[bytes]:
+        return self._value
+
+    def offset(self) -> int:
+        return self._offset
+
+    def error(self) -> None:
+        return None
+
+
+class MockLog:
+    """In-process topic store: messages delivered by MockProducers, read by MockConsumers."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._topics: Dict[str, List[MockMessage]] = {}
+
+    def append(self, message: MockMessage) -> None:
+        """Store a delivered message and wake waiting consumers."""
+        with self._cond:
+            self._topics.setdefault(message.topic(), []).append(message)
+            self._cond.notify_all()
+
+    def end(self, topic: str) -> int:
+        """Return the position after the last message of topic."""
+        with self._cond:
+            return len(self._topics.get(topic, ()))
+
+    def read(self, positions: Dict[str, int], timeout: Optional[float]) -> Optional[MockMessage]:
+        """
+        Return the next message after positions in any of its topics, advancing them.
+
+        Args:
+            positions: Topic -> next position to read, updated in place
+            timeout: Seconds to wait for a message (None waits indefinitely)
+
+        Returns:
+            The message, or None on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for topic, position in positions.items():
+                    messages = self._topics.get(topic, ())
+                    if position < len(messages):
+                        positions[topic] = position + 1
+                        return messages[position]
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+
+class _Batch:
+    """Messages accumulated for one partition."""
+
+    __slots__ = ("topic", "partition", "created", "messages", "size")
+
+    def __init__(self, topic: str, partition: int):
+        self.topic = topic
+        self.partition = partition
+        self.created = time.monotonic()
+        self.messages: List[Tuple[MockMessage, Optional[Callable]]] = []
+        self.size = BATCH_OVERHEAD
+
+
+def _to_bytes(data: Any) -> Optional[bytes]:
+    if data is None or isinstance(data, bytes):
+        return data
+    return str(data).encode("utf-8")
+
+
+class MockProducer:
+    """Producer that delivers to a simulated broker over a simulated link."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        rtt_ms: float = 20.0,
+        bandwidth_mb_s: Optional[float] = 50.0,
+        partitions: int = 6,
+        log: Optional[MockLog] = None,
+    ):
+        """
+        Initialize the producer from a Kafka client configuration.
+
+        Connection and security settings are ignored; batching, compression
+        and queue limits are honoured with librdkafka's defaults.
+
+        Args:
+            config: Kafka client configuration
+            rtt_ms: Round trip time of a produce request in milliseconds
+            bandwidth_mb_s: Link bandwidth in MB/s (None for unlimited)
+            partitions: Number of partitions of every topic
+            log: Store delivered messages here for MockConsumers
+        """
+        self.linger = float(config.get("linger.ms", 5)) / 1000
+        self.batch_size = min(
+            int(config.get("batch.size", 1000000)),
+            int(config.get("message.max.bytes", 1000000)),
+        )
+        self.batch_messages = int(config.get("batch.num.messages", 10000))
+        self.max_in_flight = int(config.get("max.in.flight.requests.per.connection", 5))
+        if config.get("enable.idempotence"):
+            self.max_in_flight = min(self.max_in_flight, 5)
+        self.queue_max = int(config.get("queue.buffering.max.messages", 100000))
+
+        compression = config.get("compression.type", config.get("compression.codec", "none"))
+        if compression not in COMPRESSION_LEVELS:
+            raise ValueError(f"Unsupported compression.type: {compression}")
+        self.compression = compression
+
+        self.rtt = rtt_ms / 1000
+        self.bandwidth = bandwidth_mb_s * 1024 * 1024 if bandwidth_mb_s else None
+        self.key_serializer = config.get("key.serializer")
+        self.value_serializer = config.get("value.serializer")
+        self.partitions = partitions
+        self.log = log
+
+        self._cond = threading.Condition()
+        self._batches: Dict[Tuple[str, int], _Batch] = {}
+        self._ready: Deque[_Batch] = deque()
+        self._in_flight: List[Tuple[float, int, _Batch]] = []
+        self._sending = 0
+        self._delivered: Deque[Tuple[MockMessage, Optional[Callable]]] = deque()
+        self._outstanding = 0
+        self._flushing = 0
+        self._closed = False
+        self._link_free_at = 0.0
+        self._sequence = 0
+        self._sticky: Dict[str, int] = {}
+        self._offsets: Dict[Tuple[str, int], int] = {}
+
+        self.requests = 0
+        self.bytes_produced = 0
+        self.bytes_sent = 0
+        self.partition_counts: Dict[int, int] = {}
+
+        # Started by produce() and exits once nothing is queued or in flight
+        self._sender: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        """Messages not yet delivered plus delivery reports not yet served."""
+        return self._outstanding
+
+    def produce(
+        self,
+        topic: str,
+        value: Any = None,
+        key: Any = None,
+        partition: int = -1,
+        on_delivery: Optional[Callable] = None,
+        callback: Optional[Callable] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Enqueue a message, raising BufferError when the local queue is full.
+
+        Keyed messages are hashed to a partition; unkeyed messages stick to
+        one partition until its batch is sent, as librdkafka does.
+        """
+        if self.key_serializer is not None:
+            key = self.key_serializer(key, SerializationContext(topic, MessageField.KEY))
+        if self.value_serializer is not None:
+            value = self.value_serializer(value, SerializationContext(topic, MessageField.VALUE))
+        key = _to_bytes(key)
+        value = _to_bytes(value)
+        with self._cond:
+            if self._outstanding >= self.queue_max:
+                raise BufferError("Local: Queue full")
+            if partition < 0:
+                if key is not None:
+                    partition = zlib.crc32(key) % self.partitions
+                else:
+                    partition = self._sticky.setdefault(topic, 0)
+
+            batch = self._batches.get((topic, partition))
+            if batch is None:
+                batch = self._batches[(topic, partition)] = _Batch(topic, partition)
+                # New linger deadline for the broker thread
+                self._cond.notify_all()
+            message = MockMessage(topic, partition, key, value)
+            batch.messages.append((message, on_delivery or callback))
+            batch.size += RECORD_OVERHEAD + len(key or b"") + len(value or b"")
+
+            self._outstanding += 1
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._run, name="mock-broker", daemon=True)
+                self._sender.start()
+            self.bytes_produced += len(value or b"")
+            self.partition_counts[partition] = self.partition_counts.get(partition, 0) + 1
+
+            if batch.size >= self.batch_size or len(batch.messages) >= self.batch_messages:
+                self._seal(batch)
+                self._cond.notify_all()
+
+    def poll(self, timeout: Optional[float] = None) -> int:
+        """
+        Serve queued delivery callbacks.
+
+        Args:
+            timeout: Seconds to wait for a delivery report if none is queued
+
+        Returns:
+            Number of delivery reports served
+        """
+        with self._cond:
+            if not self._delivered and timeout:
+                self._cond.wait(None if timeout < 0 else timeout)
+            reports = list(self._delivered)
+            self._delivered.clear()
+
+        for message, on_delivery in reports:
+            if on_delivery is not None:
+                on_delivery(None, message)
+        if reports:
+            with self._cond:
+                self._outstanding -= len(reports)
+        return len(reports)
+
+    def flush(self, timeout: Optional[float] = None) -> int:
+        """
+        Send all batches without waiting for linger.ms and serve every delivery report.
+
+        Args:
+            timeout: Maximum seconds to wait (None or negative waits indefinitely)
+
+        Returns:
+            Number of messages still outstanding
+        """
+        deadline = None if timeout is None or timeout < 0 else time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+        try:
+            while self._outstanding:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self.poll(0.1 if remaining is None else min(0.1, remaining))
+        finally:
+            with self._cond:
+                self._flushing -= 1
+        return self._outstanding
+
+    def list_topics(self, topic: Optional[str] = None, timeout: float = -1) -> ClusterMetadata:
+        """Return metadata for topic (or every topic produced to) with this producer's partitions."""
+        metadata = ClusterMetadata()
+        metadata.cluster_id = "mock"
+        with self._cond:
+            names = {topic} if topic else {name for name, _ in self._offsets} | set(self._sticky)
+        for name in names:
+            topic_metadata = TopicMetadata()
+            topic_metadata.topic = name
+            for partition in range(self.partitions):
+                partition_metadata = PartitionMetadata()
+                partition_metadata.id = partition
+                topic_metadata.partitions[partition] = partition_metadata
+            metadata.topics[name] = topic_metadata
+        return metadata
+
+    def close(self) -> None:
+        """Stop the simulated broker thread without waiting for queued messages."""
+        with self._cond:
+            self._closed = True
+            sender = self._sender
+            self._cond.notify_all()
+        if sender is not None:
+            sender.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, byte and compression counters."""
+        return {
+            "requests": self.requests,
+            "bytes_produced": self.bytes_produced,
+            "bytes_sent": self.bytes_sent,
+            "compression_ratio": (
+                self.bytes_produced / self.bytes_sent if self.bytes_sent else None
+            ),
+            "partition_counts": dict(sorted(self.partition_counts.items())),
+        }
+
+    def _seal(self, batch: _Batch) -> None:
+        """Close a batch to new messages and queue it for sending (lock held)."""
+        del self._batches[(batch.topic, batch.partition)]
+        self._ready.append(batch)
+        if self._sticky.get(batch.topic) == batch.partition:
+            self._sticky[batch.topic] = (batch.partition + 1) % self.partitions
+
+    def _run(self) -> None:
+        """Simulated broker loop: seal lingering batches, send them, acknowledge them."""
+        while True:
+            with self._cond:
+                batch = None
+                while batch is None:
+                    if self._closed:
+                        self._sender = None
+                        return
+                    now = time.monotonic()
+                    self._complete(now)
+
+                    for pending in list(self._batches.values()):
+                        if self._flushing or now - pending.created >= self.linger:
+                            self._seal(pending)
+
+                    if self._ready and len(self._in_flight) + self._sending < self.max_in_flight:
+                        batch = self._ready.popleft()
+                        self._sending += 1
+                        break
+
+                    if not (self._batches or self._ready or self._in_flight or self._sending):
+                        # Idle: the next produce() starts a new thread
+                        self._sender = None
+                        return
+
+                    wake = [pending.created + self.linger for pending in self._batches.values()]
+                    if self._in_flight:
+                        wake.append(self._in_flight[0][0])
+                    self._cond.wait(max(0.0, min(wake) - now) if wake else None)
+
+            # Compress outside the lock so produce() is not held up
+            wire_size = self._compressed_size(batch)
+
+            with self._cond:
+                start = max(time.monotonic(), self._link_free_at)
+                self._link_free_at = start + (
+                    wire_size / self.bandwidth if self.bandwidth else 0.0
+                )
+                self._sequence += 1
+                heapq.heappush(
+                    self._in_flight, (self._link_free_at + self.rtt, self._sequence, batch)
+                )
+                self._sending -= 1
+                self.requests += 1
+                self.bytes_sent += wire_size
+
+    def _compressed_size(self, batch: _Batch) -> int:
+        level = COMPRESSION_LEVELS[self.compression]
+        if level is None:
+            return batch.size
+        payload = b"".join(
+            (message.key() or b"") + (message.value() or b"") for message, _ in batch.messages
+        )
+        return (
+            BATCH_OVERHEAD
+            + RECORD_OVERHEAD * len(batch.messages)
+            + len(zlib.compress(payload, level))
+        )
+
+    def _complete(self, now: float) -> None:
+        """Acknowledge requests whose round trip has finished (lock held)."""
+        while self._in_flight and self._in_flight[0][0] <= now:
+            _, _, batch = heapq.heappop(self._in_flight)
+            offset = self._offsets.get((batch.topic, batch.partition), 0)
+            for message, on_delivery in batch.messages:
+                message._offset = offset
+                offset += 1
+                self._delivered.append((message, on_delivery))
+                if self.log is not None:
+                    self.log.append(message)
+            self._offsets[(batch.topic, batch.partition)] = offset
+            self._cond.notify_all()
+
+
+class MockConsumer:
+    """Consumer reading the messages MockProducers delivered to a MockLog."""
+
+    def __init__(self, config: Dict[str, Any], log: MockLog):
+        """
+        Initialize the consumer.
+
+        Args:
+            config: Kafka client configuration; only auto.offset.reset is used
+                (latest/largest/end start after existing messages)
+            log: Topic store to read from
+        """
+        self.log = log
+        self.from_end = config.get("auto.offset.reset", "latest") in ("latest", "largest", "end")
+        self._positions: Dict[str, int] = {}
+
+    def subscribe(self, topics: List[str], on_assign: Optional[Callable] = None, **kwargs: Any) -> None:
+        """Subscribe to topics; they are assigned immediately."""
+        self._positions = {
+            topic: self.log.end(topic) if self.from_end else 0 for topic in topics
+        }
+        if on_assign is not None:
+            on_assign(self, [TopicPartition(topic, 0) for topic in topics])
+
+    def poll(self, timeout: Optional[float] = None) -> Optional[MockMessage]:
+        """Return the next message, or None if none arrives within timeout seconds."""
+        return self.log.read(self._positions, None if timeout is None or timeout < 0 else timeout)
+
+    def close(self) -> None:
+        """Stop consuming."""
+        self._positions = {}
+
+
+class MockSchemaRegistryClient:
+    """Schema Registry stand-in that assigns schema IDs without network calls."""
+
+    # Read by the legacy confluent_kafka.avro MessageSerializer
+    auto_register_schemas = True
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.subjects: Dict[str, int] = {}
+
+    def register_schema(self, subject_name: str, schema: Any, normalize_schemas: bool = False) -> int:
+        """Register schema under subject_name; identical schemas share one ID."""
+        schema_id = self._ids.setdefault(schema.schema_str, len(self._ids) + 1)
+        self.subjects[subject_name] = schema_id
+        return schema_id
+
+    def register(self, subject: str, avro_schema: Any) -> int:
+        """Legacy CachedSchemaRegistryClient.register equivalent."""
+        schema_id = self._ids.setdefault(str(avro_schema), len(self._ids) + 1)
+        self.subjects[subject] = schema_id
+        return schema_id
@@ -0,0 +1,164 @@
+"""
+Query files and send pacing for bulk query replay.
+
+read_queries streams queries from JSON lines, CSV or plain text files, and
+QueryPacer spaces sends out to a target rate with a constant, burst or
+ramp profile. Send times follow a fixed schedule from the start of the
+replay, so a slow send is caught up on rather than lowering the offered
+load.
+"""
+
+import csv
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+# Fields tried in order when no field is named, e.g. requests.jsonl uses "body"
+QUERY_FIELDS = ("query", "question", "text", "body", "title")
+
+RATE_PROFILES = ("constant", "burst", "ramp")
+
+
+def _pick_field(record: Any, field: Optional[str]) -> Optional[str]:
+    """Return the query held by a JSON value or CSV row, or None."""
+    if isinstance(record, str):
+        return record
+    if not isinstance(record, dict):
+        return None
+    for name in (field,) if field else QUERY_FIELDS:
+        value = record.get(name)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+def read_queries(path: Path, field: Optional[str] = None) -> Iterator[str]:
+    """
+    Read queries from a file, one at a time.
+
+    The format follows the extension: .jsonl/.ndjson holds one JSON string
+    or object per line, .csv has a header row, anything else is plain text
+    with one query per line (blank lines and # comments are skipped). For
+    objects and CSV rows the query is taken from field, or the first of
+    QUERY_FIELDS present; CSV files without such a column use the first
+    column, unless field was named.
+
+    The file is read lazily and stays open until the generator is
+    exhausted, so each pass of a replay calls read_queries again.
+
+    Args:
+        path: Query file
+        field: JSON key or CSV column holding the query
+
+    Yields:
+        Non-empty queries in file order
+
+    Raises:
+        ValueError: If a JSON line cannot be parsed, or field is not a
+            column of a CSV file
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if suffix in (".jsonl", ".ndjson"):
+            queries = _read_json_lines(path, f, field)
+        elif suffix == ".csv":
+            queries = _read_csv(path, f, field)
+        else:
+            queries = (line for line in (raw.strip() for raw in f) if not line.startswith("#"))
+
+        for query in queries:
+            if query and query.strip():
+                yield query.strip()
+
+
+def _read_json_lines(path: Path, f: TextIO, field: Optional[str]) -> Iterator[Optional[str]]:
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}:{line_number}: invalid JSON: {e}") from e
+        yield _pick_field(record, field)
+
+
+def _read_csv(path: Path, f: TextIO, field: Optional[str]) -> Iterator[Optional[str]]:
+    reader = csv.reader(f)
+    header = next(reader, [])
+    names = [field] if field else QUERY_FIELDS
+    column = next((header.index(name) for name in names if name in header), None)
+    if column is None:
+        if field:
+            raise ValueError(f"{path}: no column named {field!r} in the header row")
+        # No recognised header: the first row is a query too
+        column = 0
+        yield header[0] if header else None
+    for row in reader:
+        yield row[column] if len(row) > column else None
+
+
+class QueryPacer:
+    """Schedules sends at a target rate with a constant, burst or ramp profile."""
+
+    def __init__(
+        self,
+        qps: float,
+        profile: str = "constant",
+        burst: int = 100,
+        ramp_seconds: float = 10.0,
+    ):
+        """
+        Initialize the pacer.
+
+        Args:
+            qps: Target queries per second (0 sends as fast as possible)
+            profile: "constant" spaces sends evenly; "burst" sends burst
+                queries back to back, then pauses so the average is qps;
+                "ramp" raises the rate linearly from 0 to qps over
+                ramp_seconds, then holds it
+            burst: Queries per burst for the burst profile
+            ramp_seconds: Ramp duration for the ramp profile
+        """
+        if profile not in RATE_PROFILES:
+            raise ValueError(f"Unknown rate profile: {profile}")
+        self.qps = qps
+        self.profile = profile
+        self.burst = max(1, burst)
+        self.ramp_seconds = ramp_seconds
+        self.sent = 0
+        self.start: Optional[float] = None
+
+    def offset(self, index: int) -> float:
+        """Seconds after the start at which send number index is due."""
+        if self.qps <= 0:
+            return 0.0
+        if self.profile == "burst":
+            return (index // self.burst) * self.burst / self.qps
+        if self.profile == "ramp" and self.ramp_seconds > 0:
+            # Sends during the ramp integrate a rate of qps * t / ramp_seconds
+            ramp_sends = self.qps * self.ramp_seconds / 2
+            if index < ramp_sends:
+                return math.sqrt(2 * self.ramp_seconds * index / self.qps)
+            return self.ramp_seconds + (index - ramp_sends) / self.qps
+        return index / self.qps
+
+    def wait(self, idle: Callable[[float], Any] = time.sleep) -> None:
+        """
+        Block until the next send is due.
+
+        Args:
+            idle: Called with the seconds left to wait, e.g. producer.poll to
+                serve delivery reports meanwhile; may return early
+        """
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now
+        due = self.start + self.offset(self.sent)
+        while now < due:
+            idle(due - now)
+            now = time.monotonic()
+        self.sent += 1
@@ -0,0 +1,139 @@
+"""
+Avro serialization for the publisher tools.
+
+CachedAvroSerializer plugs into SerializingProducer as a key or value
+serializer. It registers its schema once per subject, keeps the returned
+schema ID, and from then on serializes each message with a single fastavro
+encode behind the Confluent wire-format header (magic byte + schema ID).
+The output is byte-for-byte what AvroSerializer and the legacy AvroProducer
+produce for the same schema and ID.
+
+SchemaIdCache persists registered schema IDs between runs, so short-lived
+CLI invocations can seed CachedAvroSerializer and skip registration.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from confluent_kafka.schema_registry import Schema, topic_subject_name_strategy
+from confluent_kafka.serialization import SerializationContext, Serializer
+from fastavro import parse_schema, schemaless_writer
+
+logger = logging.getLogger(__name__)
+
+# Confluent wire format: magic byte 0 followed by a big-endian 4-byte schema ID
+_HEADER = struct.Struct(">bI")
+MAGIC_BYTE = 0
+
+
+class CachedAvroSerializer(Serializer):
+    """Avro serializer with schema IDs resolved once per subject and cached."""
+
+    def __init__(
+        self,
+        schema_registry_client: Any,
+        schema_str: str,
+        schema_ids: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the serializer.
+
+        Args:
+            schema_registry_client: Client used to register the schema
+            schema_str: Avro schema as a JSON string
+            schema_ids: Known subject -> schema ID mappings, skipping registration
+        """
+        self._registry = schema_registry_client
+        self.schema = Schema(schema_str, "AVRO")
+        self._parsed_schema = parse_schema(json.loads(schema_str))
+        self.schema_ids: Dict[str, int] = dict(schema_ids or {})
+
+    def register(self, subject: str) -> int:
+        """
+        Return the schema ID for subject, registering the schema on first use.
+
+        Args:
+            subject: Schema Registry subject, e.g. "documents-value"
+
+        Returns:
+            Schema ID
+        """
+        schema_id = self.schema_ids.get(subject)
+        if schema_id is None:
+            schema_id = self._registry.register_schema(subject, self.schema)
+            self.schema_ids[subject] = schema_id
+        return schema_id
+
+    def encode(self, obj: Any, schema_id: int) -> bytes:
+        """Encode obj with the wire-format header for schema_id."""
+        buffer = BytesIO()
+        buffer.write(_HEADER.pack(MAGIC_BYTE, schema_id))
+        schemaless_writer(buffer, self._parsed_schema, obj)
+        return buffer.getvalue()
+
+    def __call__(self, obj: Any, ctx: Optional[SerializationContext] = None) -> Optional[bytes]:
+        if obj is None:
+            return None
+        subject = topic_subject_name_strategy(ctx, None)
+        schema_id = self.schema_ids.get(subject)
+        if schema_id is None:
+            schema_id = self.register(subject)
+        return self.encode(obj, schema_id)
+
+
+class SchemaIdCache:
+    """
+    Schema IDs registered earlier, kept in a JSON file between runs.
+
+    IDs are keyed by Schema Registry URL and a hash of the schema, so a
+    different registry or a changed schema is registered afresh.
+    """
+
+    def __init__(self, path: Path, registry_url: str):
+        """
+        Load the cache.
+
+        Args:
+            path: Cache file; a missing or unreadable file starts empty
+            registry_url: Schema Registry the cached IDs belong to
+        """
+        self.path = Path(path)
+        self.registry_url = registry_url
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            self._entries = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable schema ID cache {self.path}: {e}")
+            self._entries = {}
+
+    @staticmethod
+    def _schema_key(schema_str: str) -> str:
+        return hashlib.sha256(schema_str.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, schema_str: str) -> Dict[str, int]:
+        """Return the cached subject -> schema ID mappings for a schema."""
+        registry = self._entries.get(self.registry_url, {})
+        return dict(registry.get(self._schema_key(schema_str), {}))
+
+    def update(self, schema_str: str, schema_ids: Dict[str, int]) -> None:
+        """Cache a serializer's subject -> schema ID mappings, saving the file if they are new."""
+        registry = self._entries.setdefault(self.registry_url, {})
+        cached = registry.setdefault(self._schema_key(schema_str), {})
+        if all(cached.get(subject) == schema_id for subject, schema_id in schema_ids.items()):
+            return
+        cached.update(schema_ids)
+        try:
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save schema ID cache {self.path}: {e}")
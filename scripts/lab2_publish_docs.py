@@ -16,27 +16,93 @@ Traditional Python:
 """
 
 import argparse
+import fnmatch
 import json
 import logging
+import math
 import os
 import subprocess
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-import yaml
-from confluent_kafka import avro
-from confluent_kafka.avro import AvroProducer
+from confluent_kafka import SerializingProducer
+from confluent_kafka.schema_registry import SchemaRegistryClient
 
+from .common.checkpoint import PublishCheckpoint, content_hash
+from .common.chunker import load_chunker
 from .common.cloud_detection import auto_detect_cloud_provider, validate_cloud_provider, suggest_cloud_provider
+from .common.delivery import DeliveryTracker
+from .common.metrics import Metrics, report as report_metrics
+from .common.serialization import CachedAvroSerializer
 from .common.terraform import extract_kafka_credentials, validate_terraform_state, get_project_root
 
 
+# Room left for the "# <title>" line document_from_chunk puts before a chunk
+TITLE_ALLOWANCE = 200
+
+
+def max_chunk_chars(chunk_size: int) -> int:
+    """
+    Longest document text a chunk of chunk_size can become, title line included.
+
+    chunk_documents.chunk_text lets chunks run 20% over chunk_size (plus the
+    separator of a merged small chunk) before splitting them, and a split may
+    land up to 200 characters past chunk_size at a paragraph break. Titles
+    longer than TITLE_ALLOWANCE are handled by re-splitting in load_documents.
+    """
+    return max(math.ceil(chunk_size * 1.2) + 2, chunk_size + 200) + TITLE_ALLOWANCE
+
+
+def max_fitting_chunk_size(max_document_chars: int) -> int:
+    """Largest chunk_size whose documents fit max_document_chars (see max_chunk_chars)."""
+    size = int((max_document_chars - TITLE_ALLOWANCE - 2) / 1.2)
+    while size > 0 and max_chunk_chars(size) > max_document_chars:
+        size -= 1
+    return max(size, 0)
+
+
+def fit_text(text: str, budget: int) -> List[str]:
+    """
+    Split a chunk that is still longer than budget characters.
+
+    Splits at paragraph or word breaks with chunk_documents.split_oversized,
+    sized so every piece fits; a piece with no usable break is cut hard.
+    """
+    budget = max(budget, 1)
+    size = int(min(budget / 1.2, budget - 200))
+    pieces = []
+    if size > 0:
+        pieces.append(load_chunker().split_oversized(text, size, pieces).strip())
+    else:
+        pieces.append(text)
+    return [
+        piece[start : start + budget]
+        for piece in pieces
+        if piece
+        for start in range(0, len(piece), budget)
+    ]
+
+
 class FlinkDocsPublisher:
     """Publisher for Flink documentation to Kafka using Avro format."""
 
     def __init__(
-        self, kafka_config: Dict[str, Any], schema_registry_config: Dict[str, Any]
+        self,
+        kafka_config: Dict[str, Any],
+        schema_registry_config: Dict[str, Any],
+        parse_workers: int = 4,
+        checkpoint_path: Optional[Path] = None,
+        force: bool = False,
+        tombstones: bool = False,
+        max_document_chars: int = 8000,
+        chunk_size: int = 5000,
+        simulate: Optional[Dict[str, Any]] = None,
+        stats_interval_ms: int = 0,
     ):
         """
         Initialize the publisher with Kafka and Schema Registry configuration.
@@ -44,50 +110,95 @@ class FlinkDocsPublisher:
         Args:
             kafka_config: Kafka client configuration
             schema_registry_config: Schema Registry configuration
+            parse_workers: Threads reading and parsing files ahead of the producer
+            checkpoint_path: Checkpoint of delivered documents; None disables it
+            force: Republish documents the checkpoint reports as delivered
+            tombstones: Publish tombstones for checkpointed documents no longer present
+            max_document_chars: Documents longer than this are chunked before
+                publishing (0 publishes every document whole)
+            chunk_size: Target chunk size in characters for oversized documents
+            simulate: If given, produce to an in-process MockProducer created
+                with these keyword arguments and register schemas with a
+                MockSchemaRegistryClient instead of connecting anywhere
+            stats_interval_ms: Collect librdkafka statistics into self.metrics
+                at this interval (0 disables them)
         """
+        if max_document_chars and max_chunk_chars(chunk_size) > max_document_chars:
+            raise ValueError(
+                f"chunk_size {chunk_size} can produce documents of up to "
+                f"{max_chunk_chars(chunk_size)} characters, over max_document_chars "
+                f"{max_document_chars}"
+            )
         self.kafka_config = kafka_config
         self.schema_registry_config = schema_registry_config
+        self.parse_workers = parse_workers
+        self.checkpoint_path = checkpoint_path
+        self.force = force
+        self.tombstones = tombstones
+        self.max_document_chars = max_document_chars
+        self.chunk_size = chunk_size
+        self.simulate = simulate
+        self.stats_interval_ms = stats_interval_ms
+        self.checkpoint = None
+        self.metrics = Metrics("publish_docs")
 
         # Define Avro schema for documents (compatible with existing schema)
-        self.value_schema = avro.loads(
-            json.dumps(
-                {
-                    "type": "record",
-                    "name": "documents_value",
-                    "namespace": "org.apache.flink.avro.generated.record",
-                    "fields": [
-                        {
-                            "name": "document_id",
-                            "type": ["null", "string"],
-                            "default": None,
-                        },
-                        {
-                            "name": "document_text",
-                            "type": ["null", "string"],
-                            "default": None,
-                        },
-                    ],
-                }
-            )
+        self.value_schema = json.dumps(
+            {
+                "type": "record",
+                "name": "documents_value",
+                "namespace": "org.apache.flink.avro.generated.record",
+                "fields": [
+                    {
+                        "name": "document_id",
+                        "type": ["null", "string"],
+                        "default": None,
+                    },
+                    {
+                        "name": "document_text",
+                        "type": ["null", "string"],
+                        "default": None,
+                    },
+                ],
+            }
         )
 
         # Define Avro schema for keys (simple string)
-        self.key_schema = avro.loads('"string"')
+        self.key_schema = '"string"'
 
         # Initialize producer
         self.producer = None
+        self.key_serializer = None
+        self.value_serializer = None
+        self.delivery = DeliveryTracker()
 
     def _init_producer(self) -> None:
-        """Initialize the Avro producer."""
+        """Initialize the Avro serializing producer."""
         try:
-            self.producer = AvroProducer(
-                self.kafka_config,
-                default_key_schema=self.key_schema,
-                default_value_schema=self.value_schema,
-                schema_registry=avro.CachedSchemaRegistryClient(
-                    self.schema_registry_config
+            if self.simulate is None:
+                schema_registry = SchemaRegistryClient(self.schema_registry_config)
+            else:
+                from .common.mock_kafka import MockSchemaRegistryClient
+
+                schema_registry = MockSchemaRegistryClient()
+            self.key_serializer = CachedAvroSerializer(schema_registry, self.key_schema)
+            self.value_serializer = CachedAvroSerializer(schema_registry, self.value_schema)
+            producer_config = {
+                **self.kafka_config,
+                "key.serializer": self.metrics.timed("avro_encode_key", self.key_serializer),
+                "value.serializer": self.metrics.timed(
+                    "avro_encode_value", self.value_serializer
                 ),
-            )
+            }
+            if self.stats_interval_ms:
+                producer_config["statistics.interval.ms"] = self.stats_interval_ms
+                producer_config["stats_cb"] = self.metrics.on_stats
+            if self.simulate is None:
+                self.producer = SerializingProducer(producer_config)
+            else:
+                from .common.mock_kafka import MockProducer
+
+                self.producer = MockProducer(producer_config, **self.simulate)
             logger = logging.getLogger(__name__)
             logger.info("Avro producer initialized successfully")
         except Exception as e:
@@ -95,68 +206,164 @@ class FlinkDocsPublisher:
             logger.error(f"Failed to initialize Avro producer: {e}")
             raise
 
-    def parse_markdown_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
+    def _register_schemas(self, topic: str) -> None:
+        """
+        Register the key and value schemas for topic and cache their IDs.
+
+        Done once up front so every message is a single binary encode and
+        Schema Registry problems surface before anything is produced.
+        """
+        key_id = self.key_serializer.register(f"{topic}-key")
+        value_id = self.value_serializer.register(f"{topic}-value")
+        logger = logging.getLogger(__name__)
+        logger.debug(f"Schema IDs for topic '{topic}': key {key_id}, value {value_id}")
+
+    def _read_markdown(self, file_path: Path) -> Tuple[Dict[str, Any], str]:
+        """
+        Read a markdown file and split off its YAML frontmatter.
+
+        Returns:
+            Tuple of (frontmatter, stripped markdown content)
+        """
+        # Shared, memoized parser from the chunker
+        chunker = load_chunker()
+        with self.metrics.time("file_read"):
+            content, cache_key = chunker.read_source_file(file_path)
+        self.metrics.increment("files_read")
+        self.metrics.increment("bytes_read", cache_key[2])
+        with self.metrics.time("frontmatter_parse"):
+            frontmatter, markdown_content = chunker.parse_markdown(content, cache_key)
+        return frontmatter, markdown_content.strip()
+
+    @staticmethod
+    def _make_document(
+        frontmatter: Dict[str, Any], markdown_content: str, document_id: str
+    ) -> Dict[str, Any]:
+        """Build a document from parsed frontmatter and content, titled if the frontmatter has one."""
+        # Use the given ID for uniqueness, with optional frontmatter document_id override
+        document_id = frontmatter.get("document_id", document_id)
+
+        # Combine title and content for document_text
+        title = frontmatter.get("title", "")
+        if title:
+            document_text = f"# {title}\n\n{markdown_content}"
+        else:
+            document_text = markdown_content
+
+        return {
+            "document_id": document_id,
+            "document_text": document_text,
+            "metadata": frontmatter,
+        }
+
+    def parse_markdown_file(
+        self, file_path: Path, default_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Parse a markdown file with YAML frontmatter.
 
         Args:
             file_path: Path to the markdown file
+            default_id: document_id when the frontmatter has none (default: file name)
 
         Returns:
             Dictionary with parsed content or None if parsing fails
         """
         logger = logging.getLogger(__name__)
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Split frontmatter and content
-            if content.startswith("---"):
-                parts = content.split("---", 2)
-                if len(parts) >= 3:
-                    frontmatter = yaml.safe_load(parts[1])
-                    markdown_content = parts[2].strip()
-                else:
-                    frontmatter = {}
-                    markdown_content = content
-            else:
-                frontmatter = {}
-                markdown_content = content
+            frontmatter, markdown_content = self._read_markdown(file_path)
+            return self._make_document(
+                frontmatter, markdown_content, default_id or file_path.name
+            )
 
-            # Use filename as document_id for uniqueness, with optional frontmatter document_id override
-            document_id = frontmatter.get("document_id", file_path.name)
+        except Exception as e:
+            logger.error(f"Failed to parse file {file_path}: {e}")
+            return None
 
-            # Combine title and content for document_text
-            title = frontmatter.get("title", "")
-            if title:
-                document_text = f"# {title}\n\n{markdown_content}"
-            else:
-                document_text = markdown_content
+    def load_documents(
+        self, file_path: Path, root: Optional[Path] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse a markdown file into the documents to publish.
 
-            return {
-                "document_id": document_id,
-                "document_text": document_text,
-                "metadata": frontmatter,
-            }
+        A document longer than max_document_chars is split with the
+        chunk_documents algorithm into <id>_chunk_N documents, the same
+        records chunk_documents.py followed by a publish would produce.
+        Raw documentation trees can then be published in one pass.
+
+        Documents without a frontmatter document_id are identified by their
+        path relative to root, so same-named files in nested directories do
+        not collide. For files directly in root this is the file name.
 
+        Args:
+            file_path: Path to the markdown file
+            root: Directory being published (default: the file's directory)
+
+        Returns:
+            Parsed documents; [None] if parsing fails
+        """
+        logger = logging.getLogger(__name__)
+        relative = file_path.relative_to(root) if root else Path(file_path.name)
+        try:
+            frontmatter, markdown_content = self._read_markdown(file_path)
         except Exception as e:
             logger.error(f"Failed to parse file {file_path}: {e}")
-            return None
+            return [None]
+
+        document = self._make_document(frontmatter, markdown_content, relative.as_posix())
+        if (
+            not self.max_document_chars
+            or len(document["document_text"]) <= self.max_document_chars
+        ):
+            return [document]
+
+        chunker = load_chunker()
+        title = frontmatter.get("title", "")
+        # The title line document_from_chunk adds must fit as well
+        budget = self.max_document_chars - (len(f"# {title}\n\n") if title else 0)
+        texts = []
+        for text in chunker.chunk_text(markdown_content, self.chunk_size):
+            texts.extend(fit_text(text, budget) if len(text) > budget else [text])
+        base_id = frontmatter.get("document_id", relative.with_suffix("").as_posix())
+        logger.info(
+            f"Chunked oversized document {file_path.name} "
+            f"({len(document['document_text'])} chars) into {len(texts)} chunks"
+        )
+        return [
+            document_from_chunk(
+                {
+                    "document_id": f"{base_id}_chunk_{index}",
+                    "source_file": file_path.name,
+                    "source_url": frontmatter.get("source_url", ""),
+                    "title": title,
+                    "chunk_index": index,
+                    "total_chunks": len(texts),
+                    "chunk_text": text,
+                }
+            )
+            for index, text in enumerate(texts, 1)
+        ]
 
-    def publish_document(self, document: Dict[str, Any], topic: str) -> bool:
+    def publish_document(
+        self, document: Dict[str, Any], topic: str, digest: Optional[str] = None
+    ) -> bool:
         """
         Publish a single document to Kafka.
 
+        Delivery is reported asynchronously to self.delivery, and recorded in
+        self.checkpoint when a content digest is given.
+
         Args:
             document: Document data with document_id and document_text
             topic: Kafka topic name
+            digest: Content hash to record in the checkpoint once acknowledged
 
         Returns:
-            True if successful, False otherwise
+            True if the document was enqueued, False otherwise
         """
         logger = logging.getLogger(__name__)
         try:
-            if not self.producer:
+            if self.producer is None:
                 self._init_producer()
 
             # Create Avro record
@@ -165,10 +372,14 @@ class FlinkDocsPublisher:
                 "document_text": document["document_text"],
             }
 
-            # Produce message
-            self.producer.produce(topic=topic, value=value, key=document["document_id"])
+            on_delivery = self.delivery.callback()
+            if self.checkpoint is not None and digest is not None:
+                on_delivery = self.checkpoint.callback(
+                    document["document_id"], digest, on_delivery
+                )
+            self._produce(topic, document["document_id"], value, on_delivery)
 
-            logger.info(f"Published document: {document['document_id']}")
+            logger.debug(f"Published document: {document['document_id']}")
             return True
 
         except Exception as e:
@@ -177,63 +388,475 @@ class FlinkDocsPublisher:
             )
             return False
 
-    def publish_directory(self, docs_dir: Path, topic: str) -> Dict[str, int]:
+    def publish_tombstone(self, document_id: str, topic: str) -> bool:
         """
-        Publish all markdown files in a directory to Kafka.
+        Publish a tombstone (null value) for a deleted document.
+
+        Once acknowledged the document is removed from self.checkpoint.
+
+        Args:
+            document_id: Key of the deleted document
+            topic: Kafka topic name
+
+        Returns:
+            True if the tombstone was enqueued, False otherwise
+        """
+        logger = logging.getLogger(__name__)
+        try:
+            if self.producer is None:
+                self._init_producer()
+
+            on_delivery = self.delivery.callback()
+            if self.checkpoint is not None:
+                on_delivery = self.checkpoint.callback(document_id, None, on_delivery)
+            self._produce(topic, document_id, None, on_delivery)
+
+            logger.debug(f"Published tombstone: {document_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to publish tombstone for {document_id}: {e}")
+            return False
+
+    def _produce(
+        self,
+        topic: str,
+        key: str,
+        value: Optional[Dict[str, Any]],
+        on_delivery: Callable[[Any, Any], None],
+    ) -> None:
+        """
+        Produce one message, applying backpressure while the local queue is full.
+
+        The produce_enqueue timing covers Avro encoding and any waits for
+        queue space.
+        """
+        logger = logging.getLogger(__name__)
+        with self.metrics.time("produce_enqueue"):
+            while True:
+                try:
+                    self.producer.produce(
+                        topic=topic, value=value, key=key, on_delivery=on_delivery
+                    )
+                    break
+                except BufferError:
+                    logger.debug("Producer queue full, waiting for deliveries")
+                    self.metrics.increment("queue_full_waits")
+                    self.producer.poll(0.5)
+        self.metrics.increment("messages_produced")
+
+        # Serve delivery callbacks without blocking
+        self.producer.poll(0)
+
+    def publish_directory(
+        self,
+        docs_dir: Path,
+        topic: str,
+        include: Sequence[str] = ("*.md",),
+        exclude: Sequence[str] = (),
+        recursive: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Publish all markdown files in a directory tree to Kafka.
+
+        Files are discovered lazily, so publishing starts as soon as the
+        first file is found; the total is logged once discovery finishes.
 
         Args:
             docs_dir: Directory containing markdown files
             topic: Kafka topic name
+            include: Globs a file must match (see iter_files)
+            exclude: Globs excluding files and whole directories
+            recursive: Descend into subdirectories
 
         Returns:
             Dictionary with success/failure counts
         """
         logger = logging.getLogger(__name__)
-        if not self.producer:
-            self._init_producer()
+        logger.info(f"Discovering files in {docs_dir} matching {', '.join(include)}")
+        md_files = _log_discovery(iter_files(docs_dir, include, exclude, recursive))
+
+        # Read, parse and chunk files on worker threads while this thread produces.
+        # At most 4 parsed files per worker are buffered ahead of the producer.
+        with ThreadPoolExecutor(max_workers=max(1, self.parse_workers)) as executor:
+            parsed = _bounded_map(
+                executor,
+                partial(self.load_documents, root=docs_dir),
+                md_files,
+                window=max(1, self.parse_workers) * 4,
+            )
+            documents = (document for file_documents in parsed for document in file_documents)
+            scope = {
+                "docs_dir": str(Path(docs_dir).resolve()),
+                "include": sorted(set(include)),
+                "exclude": sorted(set(exclude)),
+                "recursive": recursive,
+            }
+            return self.publish_documents(documents, topic, scope=scope)
+
+    def publish_store(self, store_path: Path, topic: str) -> Dict[str, int]:
+        """
+        Publish all chunks in a chunk store written by chunk_documents.py.
 
-        results = {"success": 0, "failed": 0, "total": 0}
+        The store is memory-mapped and its records decoded in place, so no
+        per-chunk files are opened or frontmatter parsed.
 
-        # Find all markdown files
-        md_files = list(docs_dir.glob("*.md"))
-        results["total"] = len(md_files)
+        Args:
+            store_path: Path to the chunk store file
+            topic: Kafka topic name
 
-        logger.info(f"Found {len(md_files)} markdown files to process")
+        Returns:
+            Dictionary with success/failure counts
+        """
+        logger = logging.getLogger(__name__)
 
-        for file_path in md_files:
-            logger.info(f"Processing: {file_path.name}")
+        with load_chunker().ChunkStore(str(store_path)) as store:
+            logger.info(f"Found {len(store)} chunks in store {store_path}")
+            documents = (document_from_chunk(chunk) for chunk in store)
+            scope = {"store": str(Path(store_path).resolve())}
+            return self.publish_documents(documents, topic, scope=scope)
+
+    def publish_documents(
+        self,
+        documents: Iterable[Optional[Dict[str, Any]]],
+        topic: str,
+        scope: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, int]:
+        """
+        Publish parsed documents to Kafka and wait for delivery reports.
 
-            # Parse document
-            document = self.parse_markdown_file(file_path)
-            if not document:
-                results["failed"] += 1
-                continue
+        A document only counts as successful once the broker acknowledges it.
+        Messages still undelivered when the flush times out count as timed out.
+        Each document is compared with the checkpoint: only new and changed
+        documents are published unless force is set. With tombstones set,
+        documents last published from the same scope, or from a scope this
+        one covers (see scope_covers), that are no longer present are
+        deleted; documents of other scopes are left alone.
 
-            # Publish document
-            if self.publish_document(document, topic):
-                results["success"] += 1
-            else:
-                results["failed"] += 1
+        Args:
+            documents: Parsed documents; None entries (parse failures) count as failed
+            topic: Kafka topic name
+            scope: Identifies the source and selection the documents come from
+
+        Returns:
+            Dictionary with delivery (success/failed/timed_out), change
+            (skipped/new/changed/deleted) and total counts
+        """
+        logger = logging.getLogger(__name__)
+        if self.producer is None:
+            self._init_producer()
+        self._register_schemas(topic)
+
+        self.delivery = DeliveryTracker()
+        self.metrics.histograms["delivery_ack"] = self.delivery.latency_ms
+        self.checkpoint = self._open_checkpoint(topic, scope)
+        total = 0
+        parse_failures = 0
+        not_enqueued = 0
+        changes = {"new": 0, "changed": 0, "unchanged": 0, "deleted": 0}
+        seen = set()
 
-        # Flush all messages
         try:
-            self.producer.flush(timeout=30)
-            logger.info("All messages flushed successfully")
-        except Exception as e:
-            logger.error(f"Failed to flush messages: {e}")
+            for document in documents:
+                total += 1
+                if not document:
+                    parse_failures += 1
+                    continue
+
+                digest = None
+                if self.checkpoint is not None:
+                    digest = content_hash(document)
+                    status = self.checkpoint.status(document["document_id"], digest)
+                    changes[status] += 1
+                    seen.add(document["document_id"])
+                    if status == "unchanged" and not self.force:
+                        self.checkpoint.claim(document["document_id"])
+                        continue
+
+                if not self.publish_document(document, topic, digest):
+                    not_enqueued += 1
+
+            if self.checkpoint is not None:
+                logger.info(
+                    f"Compared with checkpoint: {changes['new']} new, {changes['changed']} changed, "
+                    f"{changes['unchanged']} unchanged"
+                )
+                if changes["unchanged"] and not self.force:
+                    logger.info(
+                        f"Skipped {changes['unchanged']} documents already delivered "
+                        "with unchanged content"
+                    )
+                if self.tombstones:
+                    changes["deleted"] = self._publish_deletions(topic, seen, parse_failures)
+
+            # Flush all messages and wait for their delivery reports
+            remaining = 0
+            try:
+                with self.metrics.time("flush"):
+                    remaining = self.producer.flush(timeout=30)
+                if remaining:
+                    logger.error(f"{remaining} messages still undelivered after flush timeout")
+                else:
+                    logger.info("All messages flushed successfully")
+            except Exception as e:
+                logger.error(f"Failed to flush messages: {e}")
+                remaining = self.delivery.pending
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+                self.checkpoint = None
+
+        delivery = self.delivery.summary()
+        latency = delivery["ack_latency_ms"]
+        if latency["count"]:
+            logger.info(
+                f"Ack latency: p50 <= {latency['p50']:.0f} ms, p90 <= {latency['p90']:.0f} ms, "
+                f"p99 <= {latency['p99']:.0f} ms, max {latency['max']:.0f} ms"
+            )
+
+        return {
+            "success": delivery["acked"],
+            "skipped": 0 if self.force else changes["unchanged"],
+            "new": changes["new"],
+            "changed": changes["changed"],
+            "deleted": changes["deleted"],
+            "failed": parse_failures + not_enqueued + delivery["failed"],
+            "timed_out": delivery["timed_out"] + remaining,
+            "total": total,
+            "delivery": delivery,
+        }
+
+    def _publish_deletions(self, topic: str, seen: Set[str], parse_failures: int) -> int:
+        """
+        Publish tombstones for checkpointed documents missing from this run.
+
+        Only documents last published from the same scope, or from a scope
+        this run's scope covers (e.g. an earlier --include subset of the same
+        docs directory), are considered.
+
+        Skipped when some documents failed to parse, since their IDs are
+        unknown and they would otherwise be deleted by mistake.
+
+        Returns:
+            Number of tombstones enqueued
+        """
+        logger = logging.getLogger(__name__)
+        scope = self.checkpoint.scope_info
+        missing = self.checkpoint.missing(
+            seen, covers=partial(scope_covers, scope) if scope is not None else None
+        )
+        if not missing:
+            return 0
+        if parse_failures:
+            logger.warning(
+                f"Not deleting {len(missing)} documents missing from this run: "
+                f"{parse_failures} documents failed to parse"
+            )
+            return 0
+
+        logger.info(f"Publishing tombstones for {len(missing)} deleted documents")
+        return sum(self.publish_tombstone(document_id, topic) for document_id in missing)
 
-        return results
+    def _open_checkpoint(
+        self, topic: str, scope: Optional[Dict[str, Any]] = None
+    ) -> Optional[PublishCheckpoint]:
+        """Open the checkpoint for this cluster and topic, if checkpointing is enabled."""
+        if self.checkpoint_path is None:
+            return None
+        checkpoint = PublishCheckpoint(
+            self.checkpoint_path,
+            target={
+                "bootstrap_servers": self.kafka_config.get("bootstrap.servers"),
+                "topic": topic,
+            },
+            scope=scope,
+        )
+        logger = logging.getLogger(__name__)
+        logger.info(f"Checkpoint {self.checkpoint_path}: {len(checkpoint)} documents delivered earlier")
+        return checkpoint
 
     def close(self):
-        """Close the producer connection."""
-        if self.producer:
+        """Flush queued documents; the producer cleans up when it is released."""
+        if self.producer is not None:
             self.producer.flush()
 
 
+def iter_files(
+    root: Path,
+    include: Sequence[str] = ("*.md",),
+    exclude: Sequence[str] = (),
+    recursive: bool = True,
+) -> Iterator[Path]:
+    """
+    Lazily yield files under root that match an include glob and no exclude glob.
+
+    The tree is walked depth first with os.scandir, one directory at a time
+    and in sorted order, so files are yielded as they are found rather than
+    after the whole tree has been listed. Patterns containing "/" match the
+    path relative to root (as with fnmatch, "*" also matches "/"), others
+    match the file or directory name. An excluded directory is not
+    descended into; symlinked directories are not followed.
+
+    Args:
+        root: Directory to search
+        include: Globs a file must match, e.g. "*.md" or "reference/*.md"
+        exclude: Globs for files or directories to skip, e.g. "archive"
+        recursive: Descend into subdirectories
+
+    Yields:
+        Matching file paths
+    """
+    logger = logging.getLogger(__name__)
+    stack = [(str(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as scan:
+                entries = sorted(scan, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {directory}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            relative = prefix + entry.name
+            if _matches_any(entry.name, relative, exclude):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    subdirs.append((entry.path, relative + "/"))
+            elif entry.is_file() and _matches_any(entry.name, relative, include):
+                yield Path(entry.path)
+
+        # Reversed so subdirectories are popped in sorted order
+        stack.extend(reversed(subdirs))
+
+
+def _matches_any(name: str, relative: str, patterns: Sequence[str]) -> bool:
+    return any(
+        fnmatch.fnmatch(relative if "/" in pattern else name, pattern) for pattern in patterns
+    )
+
+
+def scope_covers(scope: Dict[str, Any], earlier: Dict[str, Any]) -> bool:
+    """
+    Check that a publish scope selects every file an earlier scope selected.
+
+    Directory scopes must share the docs directory; this scope must be at
+    least as recursive, exclude nothing the earlier one did not, and match
+    each earlier include glob with one of its own (e.g. "*.md" covers
+    "reference/*.md" and "index.md"). Store scopes only cover themselves.
+    """
+    if scope == earlier:
+        return True
+    if "docs_dir" not in scope or scope.get("docs_dir") != earlier.get("docs_dir"):
+        return False
+    if earlier.get("recursive", True) and not scope.get("recursive", True):
+        return False
+    if not set(scope.get("exclude", ())) <= set(earlier.get("exclude", ())):
+        return False
+    return all(
+        any(fnmatch.fnmatch(pattern, own) for own in scope.get("include", ()))
+        for pattern in earlier.get("include", ())
+    )
+
+
+def _log_discovery(files: Iterable[Path]) -> Iterator[Path]:
+    """Pass files through, logging the total once discovery finishes."""
+    logger = logging.getLogger(__name__)
+    count = 0
+    for path in files:
+        count += 1
+        yield path
+    logger.info(f"Discovery finished: {count} files found")
+
+
+def _bounded_map(
+    executor: ThreadPoolExecutor, func: Callable, items: Iterable, window: int
+) -> Iterator:
+    """
+    Map func over items on an executor, yielding results in input order.
+
+    At most window calls are queued or running at once, so a slow consumer
+    holds back the workers instead of letting results pile up in memory.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def document_from_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a publishable document from a chunk store record.
+
+    Produces the same document_id and document_text as parsing the chunk's
+    markdown file written by save_chunks_as_markdown.
+    """
+    metadata = {
+        key: chunk[key]
+        for key in (
+            "document_id",
+            "source_file",
+            "source_url",
+            "title",
+            "chunk_index",
+            "total_chunks",
+        )
+    }
+    title = chunk.get("title", "")
+    text = chunk["chunk_text"]
+    return {
+        "document_id": chunk["document_id"],
+        "document_text": f"# {title}\n\n{text}" if title else text,
+        "metadata": metadata,
+    }
+
+
+# Default checkpoint file, relative to the project root
+CHECKPOINT_NAME = ".publish_docs_checkpoint.jsonl"
+
+# Producer settings layered over the base client configuration.
+# "latency" keeps librdkafka's defaults (linger.ms=5, no compression) so each
+# document is sent almost as soon as it is produced. "throughput" waits longer
+# to fill larger batches and compresses them, which cuts produce requests and
+# bytes on the wire for bulk loads. Batches stay under the 2 MB default
+# max.message.bytes of Confluent Cloud topics.
+PRODUCER_PROFILES: Dict[str, Dict[str, Any]] = {
+    "latency": {},
+    "throughput": {
+        "linger.ms": 50,
+        "batch.size": 2000000,
+        "message.max.bytes": 2000000,
+        "compression.type": "zstd",
+        "enable.idempotence": True,
+    },
+}
+
+
 def create_kafka_config(
-    bootstrap_servers: str, api_key: str, api_secret: str
+    bootstrap_servers: str, api_key: str, api_secret: str, profile: str = "latency"
 ) -> Dict[str, Any]:
-    """Create Kafka client configuration."""
+    """
+    Create Kafka client configuration.
+
+    Args:
+        bootstrap_servers: Kafka bootstrap servers
+        api_key: Kafka API key
+        api_secret: Kafka API secret
+        profile: Producer profile name from PRODUCER_PROFILES
+
+    Returns:
+        Kafka client configuration
+    """
+    if profile not in PRODUCER_PROFILES:
+        raise ValueError(
+            f"Unknown producer profile '{profile}'. "
+            f"Available: {', '.join(PRODUCER_PROFILES)}"
+        )
     return {
         "bootstrap.servers": bootstrap_servers,
         "security.protocol": "SASL_SSL",
@@ -241,6 +864,7 @@ def create_kafka_config(
         "sasl.username": api_key,
         "sasl.password": api_secret,
         "client.id": "flink-docs-publisher",
+        **PRODUCER_PROFILES[profile],
     }
 
 
@@ -250,7 +874,6 @@ def create_schema_registry_config(
     """Create Schema Registry client configuration."""
     return {
         "url": schema_registry_url,
-        "basic.auth.credentials.source": "USER_INFO",
         "basic.auth.user.info": f"{api_key}:{api_secret}",
     }
 
@@ -280,7 +903,8 @@ def test_dependencies() -> bool:
     try:
         # Test imports directly since we're in the same process
         import yaml
-        import confluent_kafka.avro
+        import confluent_kafka.schema_registry
+        import fastavro
         import requests
 
         logger.info("✓ All required dependencies are available")
@@ -299,7 +923,24 @@ def run_publisher(
     cloud_provider: str,
     project_root: Path,
     dry_run: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    store_path: Optional[Path] = None,
+    parse_workers: int = 4,
+    producer_profile: str = "latency",
+    checkpoint_path: Optional[Path] = None,
+    force: bool = False,
+    tombstones: bool = False,
+    max_document_chars: int = 8000,
+    chunk_size: int = 5000,
+    resume: bool = False,
+    docs_dir: Optional[Path] = None,
+    include: Sequence[str] = ("*.md",),
+    exclude: Sequence[str] = (),
+    recursive: bool = True,
+    simulate: Optional[Dict[str, Any]] = None,
+    show_metrics: bool = False,
+    metrics_out: Optional[Path] = None,
+    stats_interval_ms: int = 0
 ) -> int:
     """
     Run the document publisher with extracted credentials.
@@ -309,6 +950,28 @@ def run_publisher(
         project_root: Project root directory
         dry_run: If True, validate setup but don't publish
         verbose: If True, show detailed output
+        store_path: Chunk store to publish instead of the markdown_chunks directory
+        parse_workers: Threads reading and parsing files ahead of the producer
+        producer_profile: Producer settings profile (latency/throughput)
+        checkpoint_path: Checkpoint file (defaults to CHECKPOINT_NAME in project_root);
+            implies resume
+        force: Republish documents the checkpoint reports as delivered
+        tombstones: Publish tombstones for checkpointed documents no longer present
+        max_document_chars: Chunk documents longer than this before publishing (0 disables)
+        chunk_size: Target chunk size in characters for oversized documents
+        resume: Skip documents the checkpoint reports as delivered unchanged.
+            Off by default: the checkpoint cannot tell that the topic was
+            recreated since, and would then skip every document
+        docs_dir: Directory tree to publish instead of the markdown_chunks directory
+        include: Globs selecting files to publish
+        exclude: Globs for files and directories to skip
+        recursive: Descend into subdirectories of the docs directory
+        simulate: MockProducer arguments; if given, publish through the full
+            pipeline into an in-process broker stand-in without credentials,
+            checkpoint or network, and report client-side throughput
+        show_metrics: Print per-stage timings and counters when done
+        metrics_out: Export metrics to this file (.json for JSON, else Prometheus text)
+        stats_interval_ms: librdkafka statistics interval (0 disables them)
 
     Returns:
         Exit code (0 for success)
@@ -316,56 +979,99 @@ def run_publisher(
     logger = logging.getLogger(__name__)
 
     try:
-        # Extract credentials from terraform state
-        credentials = extract_kafka_credentials(cloud_provider, project_root)
-
-        # Test dependencies first
-        if not test_dependencies():
-            return 1
-
-        if dry_run:
-            logger.info("✓ Dry run successful - all dependencies and credentials are ready")
-            logger.info(f"Would publish to topic 'documents' in cluster '{credentials['cluster_name']}'")
-            logger.info(f"Environment: {credentials['environment_name']}")
-            logger.info(f"Bootstrap servers: {credentials['bootstrap_servers']}")
-            return 0
+        if simulate is not None:
+            # No credentials or cluster: publish into an in-process broker stand-in
+            kafka_config = create_kafka_config(
+                "simulated:9092", "", "", profile=producer_profile
+            )
+            schema_registry_config = {}
+            checkpoint_path = None
+            logger.info("Simulating publish against an in-process broker stand-in")
+            logger.info(f"Producer profile: {producer_profile}")
+        else:
+            # Extract credentials from terraform state
+            credentials = extract_kafka_credentials(cloud_provider, project_root)
 
-        # Create Kafka and Schema Registry configurations
-        kafka_config = create_kafka_config(
-            credentials["bootstrap_servers"],
-            credentials["kafka_api_key"],
-            credentials["kafka_api_secret"]
-        )
+            # Test dependencies first
+            if not test_dependencies():
+                return 1
 
-        schema_registry_config = create_schema_registry_config(
-            credentials["schema_registry_url"],
-            credentials["schema_registry_api_key"],
-            credentials["schema_registry_api_secret"]
-        )
+            if dry_run:
+                logger.info("✓ Dry run successful - all dependencies and credentials are ready")
+                logger.info(f"Would publish to topic 'documents' in cluster '{credentials['cluster_name']}'")
+                logger.info(f"Environment: {credentials['environment_name']}")
+                logger.info(f"Bootstrap servers: {credentials['bootstrap_servers']}")
+                logger.info(f"Producer profile: {producer_profile}")
+                return 0
+
+            # Create Kafka and Schema Registry configurations
+            kafka_config = create_kafka_config(
+                credentials["bootstrap_servers"],
+                credentials["kafka_api_key"],
+                credentials["kafka_api_secret"],
+                profile=producer_profile
+            )
+
+            schema_registry_config = create_schema_registry_config(
+                credentials["schema_registry_url"],
+                credentials["schema_registry_api_key"],
+                credentials["schema_registry_api_secret"]
+            )
 
-        logger.info(f"Publishing to topic 'documents' in cluster '{credentials['cluster_name']}'")
+            logger.info(f"Publishing to topic 'documents' in cluster '{credentials['cluster_name']}'")
+            logger.info(f"Producer profile: {producer_profile}")
+            if resume or tombstones or checkpoint_path:
+                checkpoint_path = checkpoint_path or project_root / CHECKPOINT_NAME
 
         # Initialize publisher
-        publisher = FlinkDocsPublisher(kafka_config, schema_registry_config)
+        publisher = FlinkDocsPublisher(
+            kafka_config,
+            schema_registry_config,
+            parse_workers=parse_workers,
+            checkpoint_path=checkpoint_path,
+            force=force,
+            tombstones=tombstones,
+            max_document_chars=max_document_chars,
+            chunk_size=chunk_size,
+            simulate=simulate,
+            stats_interval_ms=stats_interval_ms,
+        )
 
         try:
-            # Use markdown_chunks directory instead of full docs
-            docs_dir = project_root / "assets/lab2/flink_docs/markdown_chunks"
+            start = time.perf_counter()
+            if store_path:
+                if not store_path.exists():
+                    logger.error(f"Chunk store not found: {store_path}")
+                    return 1
+
+                logger.info(f"Publishing document chunks from store {store_path} to topic 'documents'")
+                results = publisher.publish_store(store_path, "documents")
+            else:
+                # Use markdown_chunks directory instead of full docs
+                docs_dir = docs_dir or project_root / "assets/lab2/flink_docs/markdown_chunks"
 
-            if not docs_dir.exists():
-                logger.error(f"Markdown chunks directory not found: {docs_dir}")
-                return 1
+                if not docs_dir.is_dir():
+                    logger.error(f"Docs directory not found: {docs_dir}")
+                    return 1
 
-            logger.info(f"Publishing document chunks from {docs_dir} to topic 'documents'")
+                logger.info(f"Publishing documents from {docs_dir} to topic 'documents'")
 
-            # Publish all documents
-            results = publisher.publish_directory(docs_dir, "documents")
+                # Publish all documents
+                results = publisher.publish_directory(
+                    docs_dir, "documents", include, exclude, recursive
+                )
+            elapsed = time.perf_counter() - start
 
             logger.info(
-                f"Publishing complete: {results['success']} successful, {results['failed']} failed out of {results['total']} total"
+                f"Publishing complete: {results['success']} delivered, "
+                f"{results['skipped']} unchanged, {results['deleted']} deleted, "
+                f"{results['failed']} failed, "
+                f"{results['timed_out']} timed out out of {results['total']} total"
             )
+            if simulate is not None:
+                log_simulation_report(results, publisher.producer.stats(), elapsed)
 
-            if results["failed"] > 0:
+            if results["failed"] > 0 or results["timed_out"] > 0:
                 logger.error("✗ Some documents failed to publish")
                 return 1
             else:
@@ -374,6 +1080,7 @@ def run_publisher(
 
         finally:
             publisher.close()
+            report_metrics(publisher.metrics, show_metrics, metrics_out)
 
     except Exception as e:
         logger.error(f"Publisher failed: {e}")
@@ -383,6 +1090,26 @@ def run_publisher(
         return 1
 
 
+def log_simulation_report(
+    results: Dict[str, Any], stats: Dict[str, Any], elapsed: float
+) -> None:
+    """Log the throughput reached by a simulated publish."""
+    logger = logging.getLogger(__name__)
+    documents = results["success"]
+    megabytes = stats["bytes_produced"] / (1024 * 1024)
+    logger.info(
+        f"Simulation: {documents} docs, {megabytes:.1f} MB encoded in {elapsed:.2f} s"
+    )
+    if elapsed > 0:
+        logger.info(
+            f"Simulated throughput: {documents / elapsed:.0f} docs/s, "
+            f"{megabytes / elapsed:.1f} MB/s"
+        )
+    if stats["compression_ratio"]:
+        logger.info(f"Compression ratio: {stats['compression_ratio']:.2f}")
+    logger.info(f"Produce requests: {stats['requests']}")
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create and configure argument parser."""
     parser = argparse.ArgumentParser(
@@ -395,6 +1122,14 @@ Examples:
   uv run publish_docs aws          # Publish to AWS environment
   uv run publish_docs azure        # Publish to Azure environment
   uv run publish_docs --dry-run --verbose
+  uv run publish_docs --store chunks.store   # Publish from a chunk store
+  uv run publish_docs --docs-dir ~/docs-mirror --exclude archive   # Nested docs tree
+  uv run publish_docs --producer-profile throughput   # Bulk load
+  uv run publish_docs --resume     # Only publish documents new or changed since the last run
+  uv run publish_docs --resume --force   # Republish everything, refreshing the checkpoint
+  uv run publish_docs --tombstones # Also delete documents removed since the last publish
+  uv run publish_docs --simulate --producer-profile throughput   # Offline throughput check
+  uv run publish_docs --metrics --stats-interval-ms 1000 --metrics-out publish.prom
 
 Traditional Python:
   python scripts/lab2_publish_docs.py
@@ -414,6 +1149,149 @@ Traditional Python:
         help="Validate setup and credentials without publishing documents"
     )
 
+    parser.add_argument(
+        "--docs-dir",
+        type=Path,
+        help="Directory tree of markdown files to publish "
+        "(default: assets/lab2/flink_docs/markdown_chunks)"
+    )
+
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="Publish files matching this glob; patterns with '/' match the path "
+        "relative to the docs directory (repeatable, default: *.md)"
+    )
+
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip files and directories matching this glob (repeatable)"
+    )
+
+    parser.add_argument(
+        "--no-recursive",
+        dest="recursive",
+        action="store_false",
+        help="Only publish files directly in the docs directory"
+    )
+
+    parser.add_argument(
+        "--store",
+        type=Path,
+        help="Publish chunks from a chunk store (chunk_documents.py --output-store) "
+        "instead of the markdown_chunks directory"
+    )
+
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=4,
+        help="Threads reading and parsing files while the producer sends (default: 4)"
+    )
+
+    parser.add_argument(
+        "--producer-profile",
+        choices=sorted(PRODUCER_PROFILES),
+        default="latency",
+        help="Producer settings: 'latency' sends each document promptly, "
+        "'throughput' batches and compresses for bulk loads (default: latency)"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip documents a previous run already delivered with unchanged content, "
+        "using the checkpoint. Do not use after the topic was recreated, e.g. by "
+        "re-applying lab2; the checkpoint cannot tell and would skip everything"
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help=f"Checkpoint file for --resume and --tombstones; implies --resume "
+        f"(default: {CHECKPOINT_NAME} in the project root)"
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="With --resume, republish all documents, even those the checkpoint reports "
+        "as delivered"
+    )
+
+    parser.add_argument(
+        "--tombstones",
+        action="store_true",
+        help="Publish tombstones (null values) for documents last published from the "
+        "same source and --include/--exclude selection that no longer exist in it; "
+        "uses the checkpoint like --resume"
+    )
+
+    parser.add_argument(
+        "--max-doc-chars",
+        type=int,
+        default=8000,
+        help="Chunk documents longer than this many characters on the fly, so raw "
+        "docs can be published without running chunk_documents.py first "
+        "(0 disables; default: 8000)"
+    )
+
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=5000,
+        help="Target chunk size in characters for oversized documents; chunks can run "
+        "20%% over it, which must still fit --max-doc-chars (default: 5000)"
+    )
+
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Parse, encode and produce every document into an in-process broker and "
+        "Schema Registry stand-in, then report docs/s and MB/s; needs no credentials "
+        "and leaves the checkpoint untouched"
+    )
+
+    parser.add_argument(
+        "--simulate-rtt-ms",
+        type=float,
+        default=0.0,
+        help="Produce request round trip of the simulated broker in ms (default: 0)"
+    )
+
+    parser.add_argument(
+        "--simulate-bandwidth",
+        type=float,
+        metavar="MB_S",
+        help="Link bandwidth of the simulated broker in MB/s (default: unlimited)"
+    )
+
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print per-stage timings (file read, frontmatter parse, Avro encode, "
+        "produce enqueue, delivery ack, flush) and counters when done"
+    )
+
+    parser.add_argument(
+        "--metrics-out",
+        type=Path,
+        metavar="FILE",
+        help="Export metrics to FILE: JSON if it ends in .json, Prometheus text otherwise"
+    )
+
+    parser.add_argument(
+        "--stats-interval-ms",
+        type=int,
+        default=0,
+        help="Collect librdkafka statistics at this interval into the metrics "
+        "(default: 0, disabled)"
+    )
+
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -428,6 +1306,14 @@ def main() -> None:
     parser = create_argument_parser()
     args = parser.parse_args()
 
+    if args.max_doc_chars and max_chunk_chars(args.chunk_size) > args.max_doc_chars:
+        parser.error(
+            f"--chunk-size {args.chunk_size} can produce documents of up to "
+            f"{max_chunk_chars(args.chunk_size)} characters with their title line; keep it "
+            f"at or below {max_fitting_chunk_size(args.max_doc_chars)} "
+            f"for --max-doc-chars {args.max_doc_chars}"
+        )
+
     logger = setup_logging(args.verbose)
     logger.info("Quickstart Streaming Agents - Document Publisher")
 
@@ -438,7 +1324,13 @@ def main() -> None:
 
         # Determine cloud provider
         cloud_provider = args.cloud_provider
-        if not cloud_provider:
+        simulate = None
+        if args.simulate:
+            simulate = {
+                "rtt_ms": args.simulate_rtt_ms,
+                "bandwidth_mb_s": args.simulate_bandwidth,
+            }
+        elif not cloud_provider:
             cloud_provider = auto_detect_cloud_provider()
             if not cloud_provider:
                 logger.error("Could not auto-detect cloud provider")
@@ -448,10 +1340,11 @@ def main() -> None:
             if not validate_cloud_provider(cloud_provider):
                 sys.exit(1)
 
-        logger.info(f"Target cloud provider: {cloud_provider.upper()}")
+        if simulate is None:
+            logger.info(f"Target cloud provider: {cloud_provider.upper()}")
 
         # Validate terraform state
-        if not validate_terraform_state(cloud_provider, project_root):
+        if simulate is None and not validate_terraform_state(cloud_provider, project_root):
             logger.error(f"Terraform state validation failed for {cloud_provider}")
             logger.error(f"Please run 'terraform apply' in {cloud_provider}/core/ and {cloud_provider}/lab2-vector-search/")
             sys.exit(1)
@@ -461,7 +1354,24 @@ def main() -> None:
             cloud_provider=cloud_provider,
             project_root=project_root,
             dry_run=args.dry_run,
-            verbose=args.verbose
+            verbose=args.verbose,
+            store_path=args.store,
+            parse_workers=args.parse_workers,
+            producer_profile=args.producer_profile,
+            resume=args.resume,
+            checkpoint_path=args.checkpoint,
+            force=args.force,
+            tombstones=args.tombstones,
+            max_document_chars=args.max_doc_chars,
+            chunk_size=args.chunk_size,
+            docs_dir=args.docs_dir,
+            include=args.include or ["*.md"],
+            exclude=args.exclude,
+            recursive=args.recursive,
+            simulate=simulate,
+            show_metrics=args.metrics,
+            metrics_out=args.metrics_out,
+            stats_interval_ms=args.stats_interval_ms
         )
 
         if args.dry_run:
@@ -5,11 +5,17 @@ Unified query publisher for quickstart-streaming-agents.
 Cross-platform tool for publishing queries to Kafka topics using Avro format.
 Supports both AWS and Azure deployments with automatic cloud provider detection.
 
+QueryPublisher.publish_query waits for each query's delivery report, while
+publish_query_async returns a future per query and leaves messages to be
+batched, for load tests and replays; close() flushes whatever is queued.
+
 Usage:
     uv run publish_queries "How do I use window functions?"   # Auto-detect
     uv run publish_queries                                    # Interactive mode
     uv run publish_queries aws "How do I join tables?"        # Specify provider
     uv run publish_queries azure "What is watermarking?"
+    uv run publish_queries --replay queries.jsonl --qps 200  # Bulk replay
+    uv run publish_queries --probe 20                        # End-to-end latency
 
 Traditional Python:
     python scripts/lab2_publish_queries.py
@@ -21,16 +27,19 @@ import json
 import logging
 import sys
 import time
-import warnings
-from typing import Any, Dict
-
-# Suppress the deprecation warning for AvroProducer
-warnings.filterwarnings("ignore", message="AvroProducer has been deprecated")
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 
-from confluent_kafka import avro
-from confluent_kafka.avro import AvroProducer
+from confluent_kafka import OFFSET_END, Consumer, KafkaException, SerializingProducer, TopicPartition
+from confluent_kafka.schema_registry import SchemaRegistryClient
 
 from .common.cloud_detection import auto_detect_cloud_provider, validate_cloud_provider, suggest_cloud_provider
+from .common.latency_probe import LatencyProbe
+from .common.metrics import DEFAULT_BUCKETS_MS, Metrics, report as report_metrics
+from .common.replay import RATE_PROFILES, QueryPacer, read_queries
+from .common.serialization import CachedAvroSerializer, SchemaIdCache
 from .common.terraform import extract_kafka_credentials, validate_terraform_state, get_project_root
 
 
@@ -47,72 +56,151 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
 class QueryPublisher:
     """Unified query publisher for Kafka using Avro format."""
 
-    def __init__(self, kafka_config: Dict[str, Any], schema_registry_config: Dict[str, Any], environment_id: str = None, cluster_id: str = None):
-        """Initialize the publisher with Kafka and Schema Registry configuration."""
+    def __init__(self, kafka_config: Dict[str, Any], schema_registry_config: Dict[str, Any], environment_id: str = None, cluster_id: str = None, stats_interval_ms: int = 0, schema_cache_path: Optional[Path] = None, simulate: Optional[Dict[str, Any]] = None, key_strategy: str = "content", session_id: Optional[str] = None):
+        """
+        Initialize the publisher with Kafka and Schema Registry configuration.
+
+        Per-stage timings and counters are collected in self.metrics, plus
+        librdkafka statistics every stats_interval_ms if it is non-zero.
+        With schema_cache_path, schema IDs registered by earlier runs are
+        reused from that file instead of being registered again. With
+        simulate, queries go to an in-process MockProducer created with
+        those keyword arguments and a MockSchemaRegistryClient.
+
+        key_strategy chooses message keys (see KEY_STRATEGIES): "content"
+        hashes the query so identical queries share a key and partition,
+        "none" leaves keys null so messages spread over all partitions,
+        "session" uses session_id (random if not given) for every query to
+        keep them in order, and "unique" gives each message a fresh key.
+        """
+        if key_strategy not in KEY_STRATEGIES:
+            raise ValueError(f"Unknown key strategy: {key_strategy}")
         self.kafka_config = kafka_config
         self.schema_registry_config = schema_registry_config
         self.environment_id = environment_id
         self.cluster_id = cluster_id
+        self.stats_interval_ms = stats_interval_ms
+        self.schema_cache_path = schema_cache_path
+        self.schema_cache = None
+        self.simulate = simulate
+        self.key_strategy = key_strategy
+        self.session_id = session_id or uuid.uuid4().hex
+        self.metrics = Metrics("publish_queries")
         self.logger = logging.getLogger(__name__)
 
         # Define Avro schema for queries
-        self.value_schema = avro.loads(
-            json.dumps({
-                "type": "record",
-                "name": "queries_value",
-                "namespace": "org.apache.flink.avro.generated.record",
-                "fields": [
-                    {"name": "query", "type": ["null", "string"], "default": None}
-                ],
-            })
-        )
-
-        self.key_schema = avro.loads('"string"')
+        self.value_schema = json.dumps({
+            "type": "record",
+            "name": "queries_value",
+            "namespace": "org.apache.flink.avro.generated.record",
+            "fields": [
+                {"name": "query", "type": ["null", "string"], "default": None}
+            ],
+        })
+
+        self.key_schema = '"string"'
         self.producer = None
+        self.key_serializer = None
+        self.value_serializer = None
+        self._registered_topics = set()
 
     def _init_producer(self) -> None:
-        """Initialize the Avro producer."""
+        """Initialize the Avro serializing producer."""
         try:
-            self.producer = AvroProducer(
-                self.kafka_config,
-                default_key_schema=self.key_schema,
-                default_value_schema=self.value_schema,
-                schema_registry=avro.CachedSchemaRegistryClient(
-                    self.schema_registry_config
-                ),
-            )
-            self.logger.debug("AvroProducer initialized successfully")
+            if self.simulate is None:
+                schema_registry = SchemaRegistryClient(self.schema_registry_config)
+            else:
+                from .common.mock_kafka import MockSchemaRegistryClient
+
+                schema_registry = MockSchemaRegistryClient()
+            key_ids = value_ids = None
+            if self.schema_cache_path is not None:
+                self.schema_cache = SchemaIdCache(
+                    self.schema_cache_path, self.schema_registry_config.get("url", "")
+                )
+                key_ids = self.schema_cache.get(self.key_schema)
+                value_ids = self.schema_cache.get(self.value_schema)
+            self.key_serializer = CachedAvroSerializer(schema_registry, self.key_schema, key_ids)
+            self.value_serializer = CachedAvroSerializer(schema_registry, self.value_schema, value_ids)
+            producer_config = {
+                **self.kafka_config,
+                "key.serializer": self.metrics.timed("avro_encode_key", self.key_serializer),
+                "value.serializer": self.metrics.timed("avro_encode_value", self.value_serializer),
+            }
+            if self.stats_interval_ms:
+                producer_config["statistics.interval.ms"] = self.stats_interval_ms
+                producer_config["stats_cb"] = self.metrics.on_stats
+            if self.simulate is None:
+                self.producer = SerializingProducer(producer_config)
+            else:
+                from .common.mock_kafka import MockProducer
+
+                self.producer = MockProducer(producer_config, **self.simulate)
+            self.logger.debug("SerializingProducer initialized successfully")
         except Exception as e:
             self.logger.error(f"Failed to initialize Avro producer: {e}")
             raise
 
-    def publish_query(self, query: str, topic: str = "queries") -> bool:
+    def _register_schemas(self, topic: str) -> None:
+        """Register the key and value schemas for topic once and cache their IDs."""
+        key_id = self.key_serializer.register(f"{topic}-key")
+        value_id = self.value_serializer.register(f"{topic}-value")
+        self.logger.debug(f"Schema IDs for topic '{topic}': key {key_id}, value {value_id}")
+        if self.schema_cache is not None:
+            self.schema_cache.update(self.key_schema, self.key_serializer.schema_ids)
+            self.schema_cache.update(self.value_schema, self.value_serializer.schema_ids)
+
+    def check_connection(self, topic: str = "queries", timeout: float = 10) -> bool:
+        """
+        Connect to the cluster and make sure the schemas for topic are registered.
+
+        Uses the producer that later publishes, so its broker connection and
+        schema IDs are reused rather than set up twice.
+
+        Returns:
+            True if Schema Registry was contacted, False if both schema IDs
+            came from the schema cache
+
+        Raises:
+            Exception: If the cluster or Schema Registry cannot be reached
         """
-        Publish a single query to Kafka.
+        if self.producer is None:
+            self._init_producer()
+        # Fetching metadata opens the broker connection the producer keeps
+        self.producer.list_topics(topic, timeout=timeout)
+        cached = (
+            f"{topic}-key" in self.key_serializer.schema_ids
+            and f"{topic}-value" in self.value_serializer.schema_ids
+        )
+        if topic not in self._registered_topics:
+            self._register_schemas(topic)
+            self._registered_topics.add(topic)
+        return not cached
+
+    def publish_query(self, query: str, topic: str = "queries", timeout: float = 10) -> bool:
+        """
+        Publish a single query to Kafka and wait until it is delivered.
+
+        Only this query's delivery report is awaited; other queries
+        published asynchronously stay queued for batching.
 
         Args:
             query: SQL query to publish
             topic: Kafka topic name (defaults to 'queries')
+            timeout: Seconds to wait for the delivery report
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            if not self.producer:
-                self._init_producer()
-
-            # Create Avro record
-            value = {"query": query}
-
-            # Use query hash with timestamp as key for uniqueness
-            key = hashlib.md5(f"{query}_{time.time()}".encode()).hexdigest()
-
-            # Produce message
-            self.logger.debug(f"Publishing query to topic '{topic}': {query[:100]}...")
-            self.producer.produce(topic=topic, value=value, key=key)
-
-            # Flush immediately to ensure delivery
-            self.producer.flush(timeout=10)
+            future = self.publish_query_async(query, topic)
+            deadline = time.monotonic() + timeout
+            while not future.done() and time.monotonic() < deadline:
+                self.producer.poll(min(0.1, max(0.0, deadline - time.monotonic())))
+            if not future.done():
+                self.logger.error(f"Query not delivered within {timeout} seconds")
+                return False
+            future.result()
 
             self.logger.info(f"✓ Query published successfully to topic '{topic}'")
             if self.environment_id and self.cluster_id:
@@ -124,13 +212,134 @@ class QueryPublisher:
             self.logger.error(f"Failed to publish query: {e}")
             return False
 
+    def publish_query_async(
+        self,
+        query: str,
+        topic: str = "queries",
+        on_delivery: Optional[Callable[[Any, Any], None]] = None,
+    ) -> Future:
+        """
+        Enqueue a query without waiting for it to be delivered.
+
+        Messages are batched by the producer and delivered in the background;
+        delivery reports are served by later publish calls, flush() and
+        close(). Waits for queue space when the local queue is full.
+
+        Args:
+            query: SQL query to publish
+            topic: Kafka topic name (defaults to 'queries')
+            on_delivery: Optional callback(err, msg) run with the delivery report
+
+        Returns:
+            Future resolving to the delivered message, or failing with a KafkaException
+
+        Raises:
+            Exception: If the producer cannot be initialized or the query encoded
+        """
+        if self.producer is None:
+            self._init_producer()
+        if topic not in self._registered_topics:
+            self._register_schemas(topic)
+            self._registered_topics.add(topic)
+
+        # Create Avro record
+        value = {"query": query}
+
+        key = self.message_key(query)
+
+        future = Future()
+        future.set_running_or_notify_cancel()
+        callback = self._delivery_callback(future, on_delivery)
+
+        # Produce message
+        self.logger.debug(f"Publishing query to topic '{topic}': {query[:100]}...")
+        with self.metrics.time("produce_enqueue"):
+            while True:
+                try:
+                    self.producer.produce(topic=topic, value=value, key=key, on_delivery=callback)
+                    break
+                except BufferError:
+                    self.metrics.increment("queue_full_waits")
+                    self.producer.poll(0.5)
+        self.metrics.increment("messages_produced")
+
+        # Serve delivery reports of earlier queries without blocking
+        self.producer.poll(0)
+        return future
+
+    def message_key(self, query: str) -> Optional[str]:
+        """Return the message key for query under the configured key strategy."""
+        if self.key_strategy == "content":
+            return hashlib.blake2b(query.encode("utf-8"), digest_size=16).hexdigest()
+        if self.key_strategy == "session":
+            return self.session_id
+        if self.key_strategy == "unique":
+            return uuid.uuid4().hex
+        return None
+
+    def _delivery_callback(
+        self, future: Future, on_delivery: Optional[Callable[[Any, Any], None]] = None
+    ) -> Callable[[Any, Any], None]:
+        """Create an on_delivery callback resolving future and timing the enqueue-to-ack latency."""
+        enqueued_at = time.perf_counter()
+        # Acks take milliseconds, so use the coarser latency buckets
+        self.metrics.histogram("delivery_ack", DEFAULT_BUCKETS_MS)
+
+        def _on_delivery(err: Any, msg: Any) -> None:
+            if err is None:
+                self.metrics.observe("delivery_ack", (time.perf_counter() - enqueued_at) * 1000)
+                self.metrics.increment("messages_acked")
+                future.set_result(msg)
+            else:
+                self.metrics.increment("messages_failed")
+                self.logger.error(f"Delivery failed for key {msg.key()!r}: {err}")
+                future.set_exception(KafkaException(err))
+            if on_delivery is not None:
+                on_delivery(err, msg)
+
+        return _on_delivery
+
+    def flush(self, timeout: float = 30) -> int:
+        """
+        Wait for every queued query to be delivered.
+
+        Returns:
+            Number of messages still undelivered after timeout
+        """
+        if self.producer is None:
+            return 0
+        with self.metrics.time("flush"):
+            remaining = self.producer.flush(timeout=timeout)
+        if remaining:
+            self.logger.error(f"{remaining} queries still undelivered after flush timeout")
+        return remaining
+
     def close(self):
-        """Close the producer connection."""
-        if self.producer:
-            self.producer.flush()
+        """Flush queued queries; the producer cleans up when it is released."""
+        if self.producer is not None:
+            self.flush()
             self.logger.debug("Producer closed")
 
 
+# Message key strategies of QueryPublisher
+KEY_STRATEGIES = ("content", "none", "session", "unique")
+
+# Consumer group ID of the probe consumer; it assigns partitions directly,
+# so the group is never joined or committed to
+PROBE_GROUP_ID = "latency-probe"
+
+# Queries the latency probe cycles through unless one is given
+PROBE_QUERIES = [
+    "How do I use window functions?",
+    "What's the proper way to deduplicate a Flink table?",
+    "How do I join a stream with a versioned table?",
+    "What is watermarking and how does it handle late events?",
+]
+
+# Schema IDs registered by earlier invocations, in the project root
+SCHEMA_CACHE_NAME = ".publish_queries_schema_ids.json"
+
+
 def create_kafka_config(bootstrap_servers: str, api_key: str, api_secret: str) -> Dict[str, Any]:
     """Create Kafka client configuration."""
     return {
@@ -148,17 +357,24 @@ def create_schema_registry_config(schema_registry_url: str, api_key: str, api_se
     """Create Schema Registry client configuration."""
     return {
         "url": schema_registry_url,
-        "basic.auth.credentials.source": "USER_INFO",
         "basic.auth.user.info": f"{api_key}:{api_secret}",
     }
 
 
-def test_kafka_connection(credentials: Dict[str, str], dry_run: bool = False) -> bool:
+def test_kafka_connection(
+    publisher: QueryPublisher,
+    topic: str = "queries",
+    dry_run: bool = False
+) -> bool:
     """
     Test Kafka connection and Schema Registry availability.
 
+    Schema Registry is only contacted when a schema ID is not in the
+    publisher's schema cache; the log line says which was checked.
+
     Args:
-        credentials: Extracted credentials
+        publisher: Publisher to test and keep open for publishing
+        topic: Topic whose schemas are registered
         dry_run: If True, only validate configuration without connecting
 
     Returns:
@@ -171,39 +387,37 @@ def test_kafka_connection(credentials: Dict[str, str], dry_run: bool = False) ->
         return True
 
     try:
-        kafka_config = create_kafka_config(
-            credentials["bootstrap_servers"],
-            credentials["kafka_api_key"],
-            credentials["kafka_api_secret"]
-        )
-
-        schema_registry_config = create_schema_registry_config(
-            credentials["schema_registry_url"],
-            credentials["schema_registry_api_key"],
-            credentials["schema_registry_api_secret"]
-        )
-
-        # Create a test publisher (this will test both Kafka and Schema Registry)
-        publisher = QueryPublisher(kafka_config, schema_registry_config)
-
-        # Initialize producer (tests connection)
-        publisher._init_producer()
-        publisher.close()
-
-        logger.info("✓ Kafka and Schema Registry connection test successful")
+        if publisher.check_connection(topic):
+            logger.info("✓ Kafka and Schema Registry connection test successful")
+        else:
+            logger.info(
+                "✓ Kafka connection test successful "
+                "(schema IDs cached, Schema Registry not contacted)"
+            )
         return True
-
     except Exception as e:
         logger.error(f"✗ Connection test failed: {e}")
         return False
 
 
-def run_interactive_mode(cloud_provider: str) -> None:
+def run_interactive_mode(
+    cloud_provider: str,
+    show_metrics: bool = False,
+    metrics_out: Optional[Path] = None,
+    stats_interval_ms: int = 0,
+    key_strategy: str = "content",
+    session_id: Optional[str] = None
+) -> None:
     """
     Run interactive query publishing mode.
 
     Args:
         cloud_provider: Target cloud provider
+        show_metrics: Print per-stage timings and counters when the session ends
+        metrics_out: Export metrics to this file (.json for JSON, else Prometheus text)
+        stats_interval_ms: librdkafka statistics interval (0 disables them)
+        key_strategy: Message key strategy (see KEY_STRATEGIES)
+        session_id: Key for the "session" strategy
     """
     logger = logging.getLogger(__name__)
 
@@ -227,7 +441,10 @@ def run_interactive_mode(cloud_provider: str) -> None:
             kafka_config,
             schema_registry_config,
             credentials.get("environment_id"),
-            credentials.get("cluster_id")
+            credentials.get("cluster_id"),
+            stats_interval_ms=stats_interval_ms,
+            key_strategy=key_strategy,
+            session_id=session_id
         )
 
         print("Interactive query mode - Type 'quit' or 'exit' to stop")
@@ -262,6 +479,7 @@ def run_interactive_mode(cloud_provider: str) -> None:
             print("\nExiting interactive mode...")
         finally:
             publisher.close()
+            report_metrics(publisher.metrics, show_metrics, metrics_out)
             logger.info("Interactive session ended")
 
     except Exception as e:
@@ -273,16 +491,29 @@ def publish_single_query(
     cloud_provider: str,
     query: str,
     topic: str = "queries",
-    dry_run: bool = False
+    dry_run: bool = False,
+    show_metrics: bool = False,
+    metrics_out: Optional[Path] = None,
+    stats_interval_ms: int = 0,
+    key_strategy: str = "content",
+    session_id: Optional[str] = None
 ) -> int:
     """
     Publish a single query to Kafka.
 
+    One producer both tests the connection and publishes, and schema IDs
+    are cached in SCHEMA_CACHE_NAME so later invocations skip registration.
+
     Args:
         cloud_provider: Target cloud provider
         query: SQL query to publish
         topic: Kafka topic name
         dry_run: If True, validate setup but don't publish
+        show_metrics: Print per-stage timings and counters when done
+        metrics_out: Export metrics to this file (.json for JSON, else Prometheus text)
+        stats_interval_ms: librdkafka statistics interval (0 disables them)
+        key_strategy: Message key strategy (see KEY_STRATEGIES)
+        session_id: Key for the "session" strategy
 
     Returns:
         Exit code (0 for success)
@@ -301,10 +532,6 @@ def publish_single_query(
             logger.info(f"Would publish query: {query}")
             return 0
 
-        # Test connection
-        if not test_kafka_connection(credentials):
-            return 1
-
         # Create publisher
         kafka_config = create_kafka_config(
             credentials["bootstrap_servers"],
@@ -322,12 +549,23 @@ def publish_single_query(
             kafka_config,
             schema_registry_config,
             credentials.get("environment_id"),
-            credentials.get("cluster_id")
+            credentials.get("cluster_id"),
+            stats_interval_ms=stats_interval_ms,
+            key_strategy=key_strategy,
+            session_id=session_id,
+            schema_cache_path=project_root / SCHEMA_CACHE_NAME
         )
 
-        # Publish query
-        success = publisher.publish_query(query, topic)
-        publisher.close()
+        try:
+            # Test the connection with the producer that then publishes
+            if not test_kafka_connection(publisher, topic):
+                return 1
+
+            # Publish query
+            success = publisher.publish_query(query, topic)
+        finally:
+            publisher.close()
+            report_metrics(publisher.metrics, show_metrics, metrics_out)
 
         return 0 if success else 1
 
@@ -336,6 +574,286 @@ def publish_single_query(
         return 1
 
 
+def run_replay(
+    cloud_provider: str,
+    replay_path: Path,
+    topic: str = "queries",
+    field: Optional[str] = None,
+    qps: float = 0,
+    rate_profile: str = "constant",
+    burst: int = 100,
+    ramp_seconds: float = 10.0,
+    repeat: int = 1,
+    dry_run: bool = False,
+    show_metrics: bool = False,
+    metrics_out: Optional[Path] = None,
+    stats_interval_ms: int = 0,
+    key_strategy: str = "content",
+    session_id: Optional[str] = None
+) -> int:
+    """
+    Replay queries from a file at a target rate, e.g. to load test the pipeline.
+
+    Queries are published asynchronously and paced by a QueryPacer; the
+    achieved rate and delivery latency percentiles are printed at the end.
+
+    Args:
+        cloud_provider: Target cloud provider
+        replay_path: JSON lines, CSV or plain text file of queries (see read_queries)
+        topic: Kafka topic name
+        field: JSON key or CSV column holding the query
+        qps: Target queries per second (0 for as fast as possible)
+        rate_profile: Pacing profile (constant/burst/ramp)
+        burst: Queries per burst for the burst profile
+        ramp_seconds: Ramp duration for the ramp profile
+        repeat: Passes over the file (0 loops until interrupted)
+        dry_run: If True, read the file and credentials but don't publish
+        show_metrics: Print per-stage timings and counters when done
+        metrics_out: Export metrics to this file (.json for JSON, else Prometheus text)
+        stats_interval_ms: librdkafka statistics interval (0 disables them)
+        key_strategy: Message key strategy (see KEY_STRATEGIES)
+        session_id: Key for the "session" strategy
+
+    Returns:
+        Exit code (0 for success)
+    """
+    logger = logging.getLogger(__name__)
+
+    try:
+        # Check the file up front; each pass then streams it again
+        if next(read_queries(replay_path, field), None) is None:
+            logger.error(f"No queries found in {replay_path}")
+            return 1
+        pacer = QueryPacer(qps, rate_profile, burst, ramp_seconds)
+
+        project_root = get_project_root()
+        credentials = extract_kafka_credentials(cloud_provider, project_root)
+
+        if dry_run:
+            logger.info("✓ Dry run successful - credentials extracted successfully")
+            count = sum(1 for _ in read_queries(replay_path, field))
+            logger.info(f"Would replay {count} queries from {replay_path} to topic '{topic}'")
+            return 0
+
+        kafka_config = create_kafka_config(
+            credentials["bootstrap_servers"],
+            credentials["kafka_api_key"],
+            credentials["kafka_api_secret"]
+        )
+
+        schema_registry_config = create_schema_registry_config(
+            credentials["schema_registry_url"],
+            credentials["schema_registry_api_key"],
+            credentials["schema_registry_api_secret"]
+        )
+
+        publisher = QueryPublisher(
+            kafka_config,
+            schema_registry_config,
+            credentials.get("environment_id"),
+            credentials.get("cluster_id"),
+            stats_interval_ms=stats_interval_ms,
+            key_strategy=key_strategy,
+            session_id=session_id
+        )
+        publisher._init_producer()
+    except Exception as e:
+        logger.error(f"Query replay failed: {e}")
+        return 1
+
+    target = f"{qps:g} qps ({rate_profile})" if qps > 0 else "unthrottled"
+    passes = "looping until interrupted" if repeat == 0 else f"{repeat} pass(es)"
+    print(f"Replaying queries from {replay_path} to '{topic}': {target}, {passes}")
+
+    sent = 0
+    failed = 0
+    read_error = None
+    start = time.perf_counter()
+    try:
+        completed_passes = 0
+        while repeat == 0 or completed_passes < repeat:
+            for query in read_queries(replay_path, field):
+                pacer.wait(publisher.producer.poll)
+                try:
+                    publisher.publish_query_async(query, topic)
+                    sent += 1
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Failed to publish query: {e}")
+            completed_passes += 1
+        send_seconds = time.perf_counter() - start
+    except KeyboardInterrupt:
+        send_seconds = time.perf_counter() - start
+        print("\nReplay interrupted, flushing queued queries...")
+    except (OSError, ValueError) as e:
+        send_seconds = time.perf_counter() - start
+        read_error = e
+        logger.error(f"Query replay failed: {e}")
+    finally:
+        undelivered = publisher.flush()
+        total_seconds = time.perf_counter() - start
+        report_metrics(publisher.metrics, show_metrics, metrics_out)
+
+    counters = publisher.metrics.counters
+    acked = int(counters.get("messages_acked", 0))
+    failed += int(counters.get("messages_failed", 0))
+    latency = publisher.metrics.histogram("delivery_ack").summary()
+
+    print(f"Sent {sent} queries in {send_seconds:.2f} s: {sent / send_seconds if send_seconds else 0:.1f} qps offered")
+    print(f"Delivered {acked} in {total_seconds:.2f} s: {acked / total_seconds if total_seconds else 0:.1f} qps achieved")
+    if failed or undelivered:
+        print(f"Failed: {failed}, undelivered: {undelivered}")
+    if latency["count"]:
+        print(
+            f"Delivery latency: p50 <= {latency['p50']:.0f} ms, p90 <= {latency['p90']:.0f} ms, "
+            f"p99 <= {latency['p99']:.0f} ms, max {latency['max']:.0f} ms"
+        )
+
+    return 0 if not failed and not undelivered and read_error is None else 1
+
+
+def run_probe(
+    cloud_provider: Optional[str],
+    count: int = 10,
+    interval: float = 1.0,
+    timeout: float = 300.0,
+    query: Optional[str] = None,
+    topic: str = "queries",
+    simulate: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Measure end-to-end latency of the RAG pipeline with tagged probe queries.
+
+    Publishes count queries, each carrying a correlation tag, and consumes
+    the downstream topics until every query has a search_results_response
+    row or timeout expires. Prints end-to-end latency percentiles and how
+    the latency splits across queries_embed and search_results.
+
+    Args:
+        cloud_provider: Target cloud provider (unused when simulating)
+        count: Probe queries to publish
+        interval: Seconds between probe queries
+        timeout: Seconds to wait for responses after the last query
+        query: Query text to probe with (default: PROBE_QUERIES in turn)
+        topic: Kafka topic the pipeline reads queries from
+        simulate: If given, run against an in-process broker and pipeline
+            stand-in; MockProducer arguments for the query producer
+
+    Returns:
+        Exit code (0 if every probe query was answered)
+    """
+    logger = logging.getLogger(__name__)
+    probe = LatencyProbe()
+    pipeline = None
+    consumer = None
+
+    try:
+        if simulate is not None:
+            from .common.latency_probe import SimulatedRagPipeline
+            from .common.mock_kafka import MockConsumer, MockLog
+
+            log = MockLog()
+            pipeline = SimulatedRagPipeline(log, source=topic)
+            pipeline.start()
+            publisher = QueryPublisher({}, {}, simulate={**simulate, "log": log})
+            consumer = MockConsumer({"auto.offset.reset": "latest"}, log)
+            consumer.subscribe(list(probe.topics))
+        else:
+            credentials = extract_kafka_credentials(cloud_provider, get_project_root())
+            kafka_config = create_kafka_config(
+                credentials["bootstrap_servers"],
+                credentials["kafka_api_key"],
+                credentials["kafka_api_secret"]
+            )
+            schema_registry_config = create_schema_registry_config(
+                credentials["schema_registry_url"],
+                credentials["schema_registry_api_key"],
+                credentials["schema_registry_api_secret"]
+            )
+            publisher = QueryPublisher(kafka_config, schema_registry_config)
+            consumer = _assign_probe_consumer(kafka_config, probe)
+
+        publisher.check_connection(topic)
+    except Exception as e:
+        logger.error(f"Latency probe failed to start: {e}")
+        if consumer is not None:
+            consumer.close()
+        if pipeline is not None:
+            pipeline.stop()
+        return 1
+
+    def consume_until(deadline: float, answered: int) -> None:
+        while time.monotonic() < deadline and probe.completed < answered:
+            publisher.producer.poll(0)
+            # Short polls so delivery reports are timestamped promptly too
+            message = consumer.poll(min(0.02, max(0.0, deadline - time.monotonic())))
+            if message is not None and message.error() is None:
+                probe.record_message(message.topic(), message.value())
+
+    print(f"Probing with {count} queries, one every {interval:g} s (run {probe.run_id})")
+    try:
+        for index in range(count):
+            tag_id, text = probe.tag(query or PROBE_QUERIES[index % len(PROBE_QUERIES)], index)
+            probe.record_sent(tag_id)
+            publisher.publish_query_async(
+                text,
+                topic,
+                on_delivery=lambda err, msg, tag_id=tag_id: (
+                    probe.record_acked(tag_id) if err is None else None
+                ),
+            )
+            consume_until(time.monotonic() + interval, count)
+        publisher.flush()
+        consume_until(time.monotonic() + timeout, count)
+    except KeyboardInterrupt:
+        print("\nProbe interrupted")
+    finally:
+        publisher.close()
+        consumer.close()
+        if pipeline is not None:
+            pipeline.stop()
+
+    print(probe.format_report())
+    return 0 if probe.completed == count else 1
+
+
+def _assign_probe_consumer(kafka_config: Dict[str, Any], probe: LatencyProbe) -> Consumer:
+    """
+    Create a consumer of the probe's downstream topics, starting at the current time.
+
+    Every partition is assigned directly and positioned by timestamp, so no
+    consumer group is joined or left behind on the cluster and nothing the
+    probe publishes is missed. Offsets are never committed.
+    """
+    start_ms = int(time.time() * 1000)
+    consumer = Consumer({
+        **kafka_config,
+        # Required by the client, but unused: assign() never joins the group
+        "group.id": PROBE_GROUP_ID,
+        "enable.auto.commit": False,
+        "auto.offset.reset": "latest",
+    })
+    try:
+        partitions = []
+        for topic in probe.topics:
+            metadata = consumer.list_topics(topic, timeout=10).topics[topic]
+            if metadata.error is not None:
+                raise KafkaException(metadata.error)
+            partitions.extend(
+                TopicPartition(topic, partition, start_ms) for partition in metadata.partitions
+            )
+        try:
+            partitions = consumer.offsets_for_times(partitions, timeout=10)
+        except KafkaException:
+            for partition in partitions:
+                partition.offset = OFFSET_END
+        consumer.assign(partitions)
+    except Exception:
+        consumer.close()
+        raise
+    return consumer
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create and configure argument parser."""
     parser = argparse.ArgumentParser(
@@ -348,6 +866,12 @@ Examples:
   uv run publish_queries                                     # Interactive mode
   uv run publish_queries aws "How do I join tables?"         # Specify provider
   uv run publish_queries "What is watermarking?" --verbose
+  uv run publish_queries "What is watermarking?" --metrics --stats-interval-ms 500
+  uv run publish_queries --replay queries.jsonl --qps 200 --repeat 0   # Load test
+  uv run publish_queries --replay questions.txt --qps 500 --rate-profile ramp --ramp-seconds 60
+  uv run publish_queries --replay requests.jsonl --field body --rate-profile burst --burst 50
+  uv run publish_queries --probe 20 --probe-interval 2   # End-to-end pipeline latency
+  uv run publish_queries --probe 50 --simulate           # Probe a local pipeline stand-in
 
 Traditional Python:
   python scripts/lab2_publish_queries.py
@@ -364,7 +888,7 @@ Traditional Python:
     parser.add_argument(
         "query",
         nargs="?",
-        help="SQL query to publish (required unless using --interactive)"
+        help="SQL query to publish (required unless using --interactive or --replay)"
     )
 
     parser.add_argument(
@@ -385,6 +909,123 @@ Traditional Python:
         help="Validate setup and credentials without publishing"
     )
 
+    parser.add_argument(
+        "--key-strategy",
+        choices=KEY_STRATEGIES,
+        default="content",
+        help="Message keys: 'content' hashes the query (identical queries share a "
+        "partition, enabling dedup and compaction), 'none' spreads messages over all "
+        "partitions, 'session' keys every query with --session-id to keep them in "
+        "order, 'unique' gives each message a random key (default: content)"
+    )
+
+    parser.add_argument(
+        "--session-id",
+        help="Key for --key-strategy session (default: random per run)"
+    )
+
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="FILE",
+        help="Publish every query in FILE: JSON lines (.jsonl), CSV (.csv) or "
+        "plain text with one query per line"
+    )
+
+    parser.add_argument(
+        "--field",
+        help="JSON key or CSV column holding the query "
+        "(default: first of query, question, text, body, title)"
+    )
+
+    parser.add_argument(
+        "--qps",
+        type=float,
+        default=0,
+        help="Target replay rate in queries per second (default: 0, as fast as possible)"
+    )
+
+    parser.add_argument(
+        "--rate-profile",
+        choices=RATE_PROFILES,
+        default="constant",
+        help="Replay pacing: evenly spaced, bursts of --burst queries, or a linear "
+        "ramp up to --qps over --ramp-seconds (default: constant)"
+    )
+
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=100,
+        help="Queries per burst for --rate-profile burst (default: 100)"
+    )
+
+    parser.add_argument(
+        "--ramp-seconds",
+        type=float,
+        default=10.0,
+        help="Ramp duration for --rate-profile ramp (default: 10)"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Passes over the replay file; 0 loops until interrupted (default: 1)"
+    )
+
+    parser.add_argument(
+        "--probe",
+        type=int,
+        metavar="N",
+        help="Publish N tagged probe queries (the query argument, or built-in samples) "
+        "and report their end-to-end latency through queries_embed, search_results "
+        "and search_results_response"
+    )
+
+    parser.add_argument(
+        "--probe-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between probe queries (default: 1)"
+    )
+
+    parser.add_argument(
+        "--probe-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds to wait for responses after the last probe query (default: 300)"
+    )
+
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="With --probe, run against an in-process broker and pipeline stand-in "
+        "instead of the cluster"
+    )
+
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print per-stage timings (Avro encode, produce enqueue, delivery ack, "
+        "flush) and counters when done"
+    )
+
+    parser.add_argument(
+        "--metrics-out",
+        type=Path,
+        metavar="FILE",
+        help="Export metrics to FILE: JSON if it ends in .json, Prometheus text otherwise"
+    )
+
+    parser.add_argument(
+        "--stats-interval-ms",
+        type=int,
+        default=0,
+        help="Collect librdkafka statistics at this interval into the metrics "
+        "(default: 0, disabled)"
+    )
+
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -398,6 +1039,8 @@ def main() -> None:
     """Main entry point."""
     parser = create_argument_parser()
     args = parser.parse_args()
+    if args.simulate and not args.probe:
+        parser.error("--simulate requires --probe")
 
     logger = setup_logging(args.verbose)
     logger.info("Quickstart Streaming Agents - Query Publisher")
@@ -407,6 +1050,18 @@ def main() -> None:
         project_root = get_project_root()
         logger.debug(f"Project root: {project_root}")
 
+        # Probe a local pipeline stand-in without any cloud resources
+        if args.simulate:
+            sys.exit(run_probe(
+                None,
+                count=args.probe,
+                interval=args.probe_interval,
+                timeout=args.probe_timeout,
+                query=args.query,
+                topic=args.topic,
+                simulate={"rtt_ms": 20.0, "bandwidth_mb_s": None}
+            ))
+
         # Determine cloud provider
         cloud_provider = args.cloud_provider
         if not cloud_provider:
@@ -427,9 +1082,48 @@ def main() -> None:
             logger.error(f"Please run 'terraform apply' in {cloud_provider}/core/ and {cloud_provider}/lab2-vector-search/")
             sys.exit(1)
 
+        # End-to-end latency probe
+        if args.probe:
+            sys.exit(run_probe(
+                cloud_provider,
+                count=args.probe,
+                interval=args.probe_interval,
+                timeout=args.probe_timeout,
+                query=args.query,
+                topic=args.topic
+            ))
+
+        # Bulk replay from a file
+        if args.replay:
+            exit_code = run_replay(
+                cloud_provider=cloud_provider,
+                replay_path=args.replay,
+                topic=args.topic,
+                field=args.field,
+                qps=args.qps,
+                rate_profile=args.rate_profile,
+                burst=args.burst,
+                ramp_seconds=args.ramp_seconds,
+                repeat=args.repeat,
+                dry_run=args.dry_run,
+                show_metrics=args.metrics,
+                metrics_out=args.metrics_out,
+                stats_interval_ms=args.stats_interval_ms,
+                key_strategy=args.key_strategy,
+                session_id=args.session_id
+            )
+            sys.exit(exit_code)
+
         # Handle interactive mode (default if no query provided)
         if args.interactive or not args.query:
-            run_interactive_mode(cloud_provider)
+            run_interactive_mode(
+                cloud_provider,
+                show_metrics=args.metrics,
+                metrics_out=args.metrics_out,
+                stats_interval_ms=args.stats_interval_ms,
+                key_strategy=args.key_strategy,
+                session_id=args.session_id
+            )
             return
 
         # Publish single query
@@ -437,7 +1131,12 @@ def main() -> None:
             cloud_provider=cloud_provider,
             query=args.query,
             topic=args.topic,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            show_metrics=args.metrics,
+            metrics_out=args.metrics_out,
+            stats_interval_ms=args.stats_interval_ms,
+            key_strategy=args.key_strategy,
+            session_id=args.session_id
         )
 
         if args.dry_run: